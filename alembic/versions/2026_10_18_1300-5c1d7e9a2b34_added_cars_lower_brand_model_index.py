@@ -0,0 +1,32 @@
+"""Added lower(brand), lower(model) Index to Cars Table
+
+Revision ID: 5c1d7e9a2b34
+Revises: 180b8a55bb78
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5c1d7e9a2b34"
+down_revision: Union[str, None] = "180b8a55bb78"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_cars_lower_brand_lower_model",
+        "cars",
+        [sa.text("lower(brand)"), sa.text("lower(model)")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_cars_lower_brand_lower_model", table_name="cars")
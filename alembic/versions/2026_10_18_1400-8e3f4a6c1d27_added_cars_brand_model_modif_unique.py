@@ -0,0 +1,44 @@
+"""Added (brand, model, modif) Unique Constraint to Cars Table
+
+Revision ID: 8e3f4a6c1d27
+Revises: 5c1d7e9a2b34
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8e3f4a6c1d27"
+down_revision: Union[str, None] = "5c1d7e9a2b34"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Удаление дубликатов, оставшихся от загрузок без уникального ключа (остается первая запись)
+    op.execute(
+        sa.text(
+            "DELETE FROM cars WHERE id IN ("
+            "SELECT id FROM ("
+            "SELECT id, row_number() OVER ("
+            "PARTITION BY brand, model, modif ORDER BY id"
+            ") AS position FROM cars"
+            ") AS duplicates WHERE position > 1"
+            ")"
+        )
+    )
+    op.create_unique_constraint(
+        "uq_cars_brand_model_modif",
+        "cars",
+        ["brand", "model", "modif"],
+        postgresql_nulls_not_distinct=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_cars_brand_model_modif", "cars", type_="unique")
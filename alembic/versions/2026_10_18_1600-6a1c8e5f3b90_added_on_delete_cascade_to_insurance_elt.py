@@ -0,0 +1,42 @@
+"""Added ON DELETE CASCADE to InsuranceElt insurance_id Foreign Key
+
+Revision ID: 6a1c8e5f3b90
+Revises: 3b9d2f70c4e1
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6a1c8e5f3b90"
+down_revision: Union[str, None] = "3b9d2f70c4e1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_constraint("insurance_elt_insurance_id_fkey", "insurance_elt", type_="foreignkey")
+    op.create_foreign_key(
+        "insurance_elt_insurance_id_fkey",
+        "insurance_elt",
+        "insurance",
+        ["insurance_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("insurance_elt_insurance_id_fkey", "insurance_elt", type_="foreignkey")
+    op.create_foreign_key(
+        "insurance_elt_insurance_id_fkey",
+        "insurance_elt",
+        "insurance",
+        ["insurance_id"],
+        ["id"],
+    )
@@ -0,0 +1,40 @@
+"""Added insurance_id and partial calc_id Indexes to InsuranceElt Table
+
+Revision ID: b47e0d2a9c15
+Revises: 6a1c8e5f3b90
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b47e0d2a9c15"
+down_revision: Union[str, None] = "6a1c8e5f3b90"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        op.f("ix_insurance_elt_insurance_id"),
+        "insurance_elt",
+        ["insurance_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_insurance_elt_calc_id_accept",
+        "insurance_elt",
+        ["calc_id"],
+        unique=False,
+        postgresql_where=sa.text('"Error" IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_insurance_elt_calc_id_accept", table_name="insurance_elt")
+    op.drop_index(op.f("ix_insurance_elt_insurance_id"), table_name="insurance_elt")
@@ -0,0 +1,156 @@
+"""
+    Общие функции бенчмарков импорта справочника авто
+
+    Синтетический справочник записывается в файл, замер выполняется в отдельном процессе
+    (python -m bench.catalog), чтобы пиковый RSS относился только к чтению и проверке файла.
+"""
+import sys
+import json
+import time
+import random
+import resource
+import subprocess
+import statistics
+
+import pandas as pd
+from openpyxl import Workbook
+
+from src.config import settings
+from src.routers.excel import reader
+from src.routers.excel.utils import CarsMatcher, clean_cars_frame
+
+FORMATS = ('xlsx', 'csv', 'parquet')
+TYPES = ('B', 'C', 'D', 'CE', 'TRUCK')
+# Цель сопоставления марки и модели на справочнике 100k строк
+MATCH_TARGET_MS = 1.0
+
+
+def generate_catalog(rows: int, brands_count: int = 500) -> pd.DataFrame:
+    """
+        Синтетический справочник: brands_count марок, уникальные модели, каждая сотая строка без модели
+    """
+    numbers = pd.Series(range(rows))
+    brands = 'Brand ' + (numbers % brands_count).astype(str)
+    models = (' Model  ' + numbers.astype(str) + ' ').where(numbers % 100 != 99, '')
+    return pd.DataFrame({
+        'brand': brands,
+        'model': models,
+        'modif': 'Modif ' + (numbers % 7).astype(str),
+        'sk_brand': brands.str.upper(),
+        'sk_model': models.str.strip().str.upper(),
+        'type': [TYPES[number % len(TYPES)] for number in range(rows)],
+    })
+
+
+def write_catalog(frame: pd.DataFrame, path: str, file_format: str):
+    """
+        Запись справочника в xlsx, csv или parquet
+    """
+    if file_format == 'csv':
+        frame.to_csv(path, index=False)
+    elif file_format == 'parquet':
+        frame.to_parquet(path, index=False)
+    else:
+        # write_only: 1M строк без построения книги в памяти
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        sheet.append(list(frame.columns))
+        for row in frame.itertuples(index=False, name=None):
+            sheet.append(row)
+        workbook.save(path)
+
+
+def read_eager(path: str) -> pd.DataFrame:
+    """
+        Чтение файла целиком, как до потокового импорта
+    """
+    with open(path, 'rb') as file:
+        magic = file.read(4)
+    if magic == reader.XLSX_MAGIC:
+        frame = pd.read_excel(path, dtype=str)
+    elif magic == reader.PARQUET_MAGIC:
+        frame = pd.read_parquet(path)
+    else:
+        frame = pd.read_csv(path, dtype=str, keep_default_na=False)
+    frame.index = frame.index + 2
+    return frame.reindex(columns=reader.CARS_COLUMNS)
+
+
+def measure(path: str, eager: bool = False, chunk_size: int = settings.CARS_IMPORT_CHUNK_SIZE) -> dict:
+    """
+        Чтение и проверка файла тем же конвейером, что и import_cars (без записи в БД)
+    """
+    started = time.perf_counter()
+    rows = valid = 0
+    if eager:
+        frames = [read_eager(path)]
+    else:
+        file = open(path, 'rb')
+        frames = reader.read_chunks(file, chunk_size)
+    for frame in frames:
+        data, _ = clean_cars_frame(frame)
+        rows += len(frame)
+        valid += len(data)
+    if not eager:
+        file.close()
+    seconds = time.perf_counter() - started
+
+    return {
+        'rows': rows,
+        'valid': valid,
+        'seconds': round(seconds, 3),
+        'rows_per_second': round(rows / seconds) if seconds else None,
+        # ru_maxrss в Linux — килобайты
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def measure_in_process(path: str, eager: bool = False) -> dict:
+    """
+        Замер в отдельном процессе
+    """
+    command = [sys.executable, '-m', 'bench.catalog', path] + (['--eager'] if eager else [])
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def measure_match(rows: int = 100_000, brands_count: int = 50, queries: int = 1000) -> dict:
+    """
+        Время CarsMatcher.match на справочнике rows строк: модели с переставленными буквами
+    """
+    frame = generate_catalog(rows, brands_count)
+    catalog = list(frame[['brand', 'model', 'sk_brand', 'sk_model']].itertuples(index=False, name=None))
+    matcher = CarsMatcher(catalog)
+
+    random_generator = random.Random(0)
+    requests = []
+    for brand, model, _, _ in random_generator.sample(catalog, queries):
+        model = model.strip()
+        index = random_generator.randrange(len(model) - 1) if len(model) > 1 else 0
+        requests.append((brand, model[:index] + model[index + 1:index + 2] + model[index:index + 1] + model[index + 2:]))
+
+    timings = []
+    for brand, model in requests:
+        started = time.perf_counter()
+        matcher.match(brand, model, limit=2)
+        timings.append((time.perf_counter() - started) * 1000)
+    return {
+        'rows': rows,
+        'mean_ms': round(statistics.mean(timings), 3),
+        'p99_ms': round(statistics.quantiles(timings, n=100)[98], 3),
+        'target_ms': MATCH_TARGET_MS,
+    }
+
+
+if __name__ == '__main__':
+    # python -m bench.catalog match [rows]
+    if sys.argv[1:2] == ['match']:
+        result = measure_match(int(sys.argv[2]) if len(sys.argv) > 2 else 100_000)
+        print(json.dumps(result))
+        sys.exit(0 if result['mean_ms'] < MATCH_TARGET_MS else 1)
+
+    # python -m bench.catalog PATH [--eager]
+    if len(sys.argv) < 2:
+        print('Usage: python -m bench.catalog PATH [--eager] | match [rows]')
+        sys.exit(1)
+    print(json.dumps(measure(sys.argv[1], eager='--eager' in sys.argv[2:])))
@@ -0,0 +1,32 @@
+"""
+    Бенчмарк форматов справочника авто: XLSX, CSV и Parquet
+
+    Один и тот же синтетический справочник записывается в каждый формат и читается
+    конвейером import_cars (определение формата, чтение пачками, проверка) без записи в БД.
+
+    python -m bench.catalog_formats [rows]
+"""
+import os
+import sys
+import tempfile
+
+from bench.catalog import FORMATS, generate_catalog, write_catalog, measure_in_process
+
+ROWS = 100_000
+
+
+def main(rows: int):
+    frame = generate_catalog(rows)
+    print(f"{'format':>8} {'size, MB':>10} {'rows/s':>10} {'peak RSS, MB':>14}")
+    with tempfile.TemporaryDirectory() as directory:
+        for file_format in FORMATS:
+            path = os.path.join(directory, f'cars_{rows}.{file_format}')
+            write_catalog(frame, path, file_format)
+            size = os.path.getsize(path) / 1024 / 1024
+
+            result = measure_in_process(path)
+            print(f"{file_format:>8} {size:>10.1f} {result['rows_per_second']:>10} {result['peak_rss_mb']:>14}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else ROWS)
@@ -0,0 +1,34 @@
+"""
+    Бенчмарк потокового импорта справочника авто из Excel
+
+    Для книг на 10k, 100k и 1M строк замеряются строки в секунду и пиковый RSS процесса
+    чтения и проверки: потоковый импорт (read-only openpyxl, пачки CARS_IMPORT_CHUNK_SIZE)
+    и чтение книги целиком через pd.read_excel. Запись в БД не замеряется.
+
+    python -m bench.import_catalog [rows ...] [--no-eager]
+"""
+import os
+import sys
+import tempfile
+
+from bench.catalog import generate_catalog, write_catalog, measure_in_process
+
+SIZES = (10_000, 100_000, 1_000_000)
+
+
+def main(sizes: list[int], eager: bool):
+    print(f"{'rows':>10} {'mode':>10} {'rows/s':>10} {'peak RSS, MB':>14}")
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in sizes:
+            path = os.path.join(directory, f'cars_{rows}.xlsx')
+            write_catalog(generate_catalog(rows), path, 'xlsx')
+
+            modes = (('streaming', False), ('eager', True)) if eager else (('streaming', False),)
+            for mode, is_eager in modes:
+                result = measure_in_process(path, eager=is_eager)
+                print(f"{rows:>10} {mode:>10} {result['rows_per_second']:>10} {result['peak_rss_mb']:>14}")
+
+
+if __name__ == '__main__':
+    arguments = [argument for argument in sys.argv[1:] if not argument.startswith('--')]
+    main([int(rows) for rows in arguments] or list(SIZES), eager='--no-eager' not in sys.argv[1:])
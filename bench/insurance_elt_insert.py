@@ -0,0 +1,62 @@
+"""
+    Бенчмарк записи котировок insurance_elt: строки в секунду до и после
+
+    before — прежний create_insurance_elt: Страхование и каждая котировка через session.add,
+    две транзакции. after — services.create_insurance_elt: upsert Страхования и котировки
+    одним INSERT в одной транзакции.
+
+    BENCH_POSTGRES_DSN=... python -m bench.insurance_elt_insert [calculations] [companies]
+"""
+import sys
+import time
+import asyncio
+
+from src.models import Insurance, InsuranceElt
+from src.routers.elt import services
+from bench.database import require_dsn, bench_schema, calculation_results
+
+CALCULATIONS = 500
+COMPANIES = 20
+
+
+async def create_insurance_elt_before(calc_id: int, calc_reso_id: int, data: list, session):
+    """
+        Запись расчета до перехода на один INSERT
+    """
+    insurance = Insurance(calc_id=calc_id, calc_reso_id=calc_reso_id)
+    session.add(insurance)
+    await session.commit()
+
+    for row in services.build_insurance_elts(calc_id, insurance.id, data):
+        session.add(InsuranceElt(**row))
+    await session.commit()
+
+
+async def create_insurance_elt_after(calc_id: int, calc_reso_id: int, data: list, session):
+    await services.create_insurance_elt(calc_id, calc_reso_id, {}, data, session)
+
+
+async def run(create, calculations: int, data: list) -> float:
+    async with bench_schema() as session_maker:
+        started = time.perf_counter()
+        for calc_id in range(1, calculations + 1):
+            async with session_maker() as session:
+                await create(calc_id, calc_id, data, session)
+        return time.perf_counter() - started
+
+
+async def main(calculations: int, companies: int):
+    data = calculation_results(companies)
+    rows = calculations * len(services.build_insurance_elts(0, 0, data))
+    print(f"{'mode':>8} {'seconds':>10} {'rows/s':>10} {'calculations/s':>16}")
+    for mode, create in (('before', create_insurance_elt_before), ('after', create_insurance_elt_after)):
+        seconds = await run(create, calculations, data)
+        print(f'{mode:>8} {seconds:>10.2f} {rows / seconds:>10.0f} {calculations / seconds:>16.1f}')
+
+
+if __name__ == '__main__':
+    require_dsn()
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else CALCULATIONS,
+        int(sys.argv[2]) if len(sys.argv) > 2 else COMPANIES,
+    ))
@@ -0,0 +1,91 @@
+"""
+    Бенчмарк сохранения расчета при одновременных записях
+
+    Писатели сохраняют расчеты по общему набору calc_reso_id (пересчеты одного расчета
+    конкурируют). Для каждого числа писателей выводятся задержка сохранения (p50, p95, p99),
+    пропускная способность и число ошибок.
+
+    before — прежняя последовательность: проверка, удаление Страхования, запись в двух
+    транзакциях. after — services.create_insurance_elt: upsert в одной транзакции.
+
+    BENCH_POSTGRES_DSN=... python -m bench.persistence_concurrency [writers ...]
+"""
+import sys
+import time
+import random
+import asyncio
+import statistics
+
+from sqlalchemy import select
+
+from src.models import Insurance
+from src.routers.elt import services
+from bench.database import require_dsn, bench_schema, calculation_results
+from bench.insurance_elt_insert import create_insurance_elt_before
+
+WRITERS = (1, 4, 16, 32)
+SAVES_PER_WRITER = 50
+KEYS = 20
+COMPANIES = 20
+
+
+async def save_before(calc_reso_id: int, data: list, session):
+    """
+        Сохранение расчета до перехода на upsert
+    """
+    insurance = (await session.execute(
+        select(Insurance).where(Insurance.calc_reso_id == calc_reso_id)
+    )).scalars().first()
+    if insurance:
+        await session.delete(insurance)
+        await session.commit()
+    await create_insurance_elt_before(calc_reso_id, calc_reso_id, data, session)
+
+
+async def save_after(calc_reso_id: int, data: list, session):
+    await services.create_insurance_elt(calc_reso_id, calc_reso_id, {}, data, session)
+
+
+async def run(save, writers: int, data: list) -> tuple[list[float], int, float]:
+    latencies, errors = [], 0
+
+    async def writer(session_maker):
+        nonlocal errors
+        for _ in range(SAVES_PER_WRITER):
+            calc_reso_id = random.randint(1, KEYS)
+            async with session_maker() as session:
+                started = time.perf_counter()
+                try:
+                    await save(calc_reso_id, data, session)
+                except Exception:
+                    errors += 1
+                    await session.rollback()
+                    continue
+                latencies.append(time.perf_counter() - started)
+
+    async with bench_schema(pool_size=writers) as session_maker:
+        started = time.perf_counter()
+        await asyncio.gather(*(writer(session_maker) for _ in range(writers)))
+        return latencies, errors, time.perf_counter() - started
+
+
+def percentile(values: list[float], percent: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else float('nan')
+    return statistics.quantiles(values, n=100)[percent - 1]
+
+
+async def main(writers_list: list[int]):
+    data = calculation_results(COMPANIES)
+    print(f"{'mode':>8} {'writers':>8} {'p50, ms':>9} {'p95, ms':>9} {'p99, ms':>9} {'saves/s':>9} {'errors':>7}")
+    for mode, save in (('before', save_before), ('after', save_after)):
+        for writers in writers_list:
+            latencies, errors, seconds = await run(save, writers, data)
+            p50, p95, p99 = (percentile(latencies, percent) * 1000 for percent in (50, 95, 99))
+            print(f'{mode:>8} {writers:>8} {p50:>9.1f} {p95:>9.1f} {p99:>9.1f} '
+                  f'{len(latencies) / seconds:>9.1f} {errors:>7}')
+
+
+if __name__ == '__main__':
+    require_dsn()
+    asyncio.run(main([int(writers) for writers in sys.argv[1:]] or list(WRITERS)))
@@ -7,7 +7,11 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from src.logger import logger
 from src.config import settings
-from src.routers import elt_router, excel_router
+from src.routers import elt_router, excel_router, ops_router
+from src.database import get_async_generator_session, ReplicaMonitor
+from src.routers.excel.utils import CarsCatalog, CarsImportJobs
+from src.routers.elt.warmer import DictionaryWarmer
+from src.routers.elt.utils import EltService, SoapServiceAsync, ResoGuaranteeAsync
 
 
 @asynccontextmanager
@@ -18,7 +22,56 @@ async def lifespan(application: FastAPI):
         ip, port = 'localhost', 31415
         socks.setdefaultproxy(socks.PROXY_TYPE_SOCKS5, ip, port)
         socket.socket = socks.socksocket
+
+    # Асинхронный клиент справочников ELT
+    try:
+        await SoapServiceAsync(settings.ELT_USERNAME, settings.ELT_PASSWORD.get_secret_value()).get_client()
+    except Exception as exc:
+        logger.error(f'ELT async SOAP client is not opened: {exc}')
+
+    # Клиент расчетов ELT
+    try:
+        await EltService(settings.ELT_USERNAME, settings.ELT_PASSWORD.get_secret_value()).get_client()
+    except Exception as exc:
+        logger.error(f'ELT calculation client is not opened: {exc}')
+
+    # Клиент Ресо Гарантии
+    try:
+        await ResoGuaranteeAsync(
+            settings.RESO_GUARANTEE_USERNAME,
+            settings.RESO_GUARANTEE_PASSWORD.get_secret_value(),
+        ).get_client()
+    except Exception as exc:
+        logger.error(f'Reso-Guarantee SOAP client is not opened: {exc}')
+
+    # Задания импорта, прерванные падением процесса
+    try:
+        async with get_async_generator_session() as session:
+            await CarsImportJobs.recover(session)
+    except Exception as exc:
+        logger.error(f'Cars import jobs are not recovered: {exc}')
+
+    # Справочник авто в памяти
+    try:
+        async with get_async_generator_session() as session:
+            await CarsCatalog.load(session)
+    except Exception as exc:
+        logger.error(f'Cars catalog is not loaded: {exc}')
+
+    # Фоновая проверка реплики для чтения
+    ReplicaMonitor.start()
+
+    # Фоновое обновление справочников ELT
+    if settings.ELT_WARMER_ENABLED:
+        DictionaryWarmer.start()
     yield
+    await DictionaryWarmer.stop()
+    await ReplicaMonitor.stop()
+    await CarsImportJobs.stop()
+    await CarsCatalog.stop()
+    await EltService.close()
+    await ResoGuaranteeAsync.close()
+    await SoapServiceAsync.close()
     logger.info("Application is End")
 
 app = FastAPI(
@@ -42,3 +95,4 @@ app.add_middleware(
 # Include Routers
 app.include_router(elt_router)
 app.include_router(excel_router)
+app.include_router(ops_router)
@@ -20,26 +20,130 @@ class AppSettings(BaseSettings):
     POSTGRES_USER: str
     POSTGRES_NAME: str
     POSTGRES_PASS: SecretStr
+    # Пул соединений: на все воркеры (pool_size + max_overflow) * воркеры < max_connections
+    POSTGRES_POOL_SIZE: int = 10
+    POSTGRES_MAX_OVERFLOW: int = 10
+    POSTGRES_POOL_TIMEOUT: float = 30
+    POSTGRES_POOL_RECYCLE: int = 1800
+    POSTGRES_POOL_PRE_PING: bool = True
+    # Кэш подготовленных запросов asyncpg на соединение (0 — для pgbouncer в режиме transaction)
+    POSTGRES_STATEMENT_CACHE_SIZE: int = 100
+    # Сколько самых долгих ожиданий соединения показывать в диагностике
+    POSTGRES_POOL_SLOWEST: int = 10
+    # Реплика для чтения (не задана — чтение идет в основную БД)
+    POSTGRES_READ_HOST: str | None = None
+    POSTGRES_READ_PORT: int | None = None
+    POSTGRES_READ_POOL_SIZE: int = 10
+    POSTGRES_READ_MAX_OVERFLOW: int = 10
+    # Допустимое отставание реплики (сек), частота и таймаут проверки
+    POSTGRES_READ_MAX_LAG: float = 5
+    POSTGRES_READ_CHECK_INTERVAL: float = 5
+    POSTGRES_READ_CHECK_TIMEOUT: float = 2
+
+    # Справочник авто в памяти
+    CARS_CATALOG_TTL: float = 300
+    # Оценка кандидата — худшая из оценок марки и модели, замена ввода только при
+    # оценке не ниже порога и отрыве от следующего кандидата не меньше CARS_MATCH_MARGIN
+    CARS_MATCH_THRESHOLD: float = 0.8
+    CARS_MATCH_MARGIN: float = 0.1
+    CARS_BRAND_ALIASES: dict[str, str] = {
+        'VW': 'Volkswagen',
+        'MB': 'Mercedes-Benz',
+        'Мерседес': 'Mercedes-Benz',
+        'Фольксваген': 'Volkswagen',
+    }
+    # Импорт справочника авто: строк в одной пачке чтения и записи
+    CARS_IMPORT_CHUNK_SIZE: int = 5000
+    # Сколько ошибок строк сохранять в отчете импорта
+    CARS_IMPORT_MAX_ERRORS: int = 1000
 
     # Elt
     ELT_URL: str
     ELT_USERNAME: str
     ELT_PASSWORD: SecretStr
+    ELT_MAX_CONNECTIONS: int = 100
+    ELT_CALCULATION_CONCURRENCY: int = 10
+    ELT_TIMEOUT: float = 240
+    ELT_METHOD_TIMEOUTS: dict[str, float] = {}
+    ELT_COMPANY_TIMEOUTS: dict[str, float] = {}
+    ELT_HEDGE_ENABLED: bool = False
+    ELT_HEDGE_PERCENTILE: float = 0.95
+    ELT_HEDGE_MIN_SAMPLES: int = 20
+    ELT_HEDGE_WINDOW: int = 200
+    # Кэш расчетов по СК для одинаковых входных данных
+    ELT_CALCULATION_CACHE_TTL: float = 600
+    ELT_CALCULATION_CACHE_MAXSIZE: int = 4096
+    # Номер расчета Ресо Гарантии становится номером сохраненного расчета, поэтому всегда новый
+    ELT_CALCULATION_CACHE_EXCLUDE: list[str] = ['RESO_GARANTIJA']
+
+    # Кэш справочников ELT: время жизни (с) по методу, методы без TTL не кэшируются
+    ELT_CACHE_MAXSIZE: int = 1024
+    ELT_CACHE_TTL: dict[str, float] = {
+        'GetAutoMarks': 3600,
+        'GetAutoModels': 3600,
+        'GetAutoModifications': 3600,
+        'GetBanks': 3600,
+        'GetDOTypes': 3600,
+        'GetOPF': 3600,
+        'GetSTOA': 3600,
+        'GetOptions': 3600,
+        'GetCountries': 86400,
+        'GetRegionsExt': 86400,
+        'GetCitiesExt': 86400,
+    }
+
+    # Время жизни в кэше устаревшего справочника из Базы Данных при недоступности ELT
+    ELT_STALE_TTL: float = 60
+
+    # Справочники ELT, сохраняемые в Базу Данных
+    ELT_PERSIST_METHODS: list[str] = [
+        'GetAutoMarks',
+        'GetAutoModels',
+        'GetAutoModifications',
+        'GetBanks',
+        'GetOptions',
+        'GetRegionsExt',
+        'GetCitiesExt',
+    ]
+
+    # Фоновое обновление справочников ELT
+    ELT_WARMER_ENABLED: bool = True
+    ELT_WARMER_METHODS: list[str] = [
+        'GetAutoMarks',
+        'GetBanks',
+        'GetDOTypes',
+        'GetOPF',
+        'GetSTOA',
+        'GetOptions',
+        'GetCountries',
+        'GetRegionsExt',
+    ]
+    ELT_WARMER_REFRESH_RATIO: float = 0.8
+    ELT_WARMER_JITTER: float = 0.1
+    ELT_WARMER_BACKOFF_BASE: float = 5
+    ELT_WARMER_BACKOFF_MAX: float = 300
+
+    # Индекс КЛАДР
+    ELT_KLADR_CONCURRENCY: int = 5
+    WSDL_SNAPSHOT_DIR: str = './wsdl_snapshot'
 
     # Ресо Гарантия
     RESO_GUARANTEE: str
     RESO_GUARANTEE_USERNAME: str
     RESO_GUARANTEE_PASSWORD: SecretStr
 
-    def build_postgres_url(self, protocol_db: str = 'postgresql+asyncpg') -> str:
+    def build_postgres_url(self, protocol_db: str = 'postgresql+asyncpg',
+                           host: str = None, port: int = None) -> str:
         """
             Build Postgres URL
             :param protocol_db protocol database
+            :param host host (default POSTGRES_HOST)
+            :param port port (default POSTGRES_PORT)
             :return: str
         """
         return (f"{protocol_db}://"
                 f"{self.POSTGRES_USER}:{self.POSTGRES_PASS.get_secret_value()}@"
-                f"{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_NAME}")
+                f"{host or self.POSTGRES_HOST}:{port or self.POSTGRES_PORT}/{self.POSTGRES_NAME}")
 
     class Config:
         env_file = '.env'
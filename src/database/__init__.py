@@ -1,6 +1,9 @@
-__all__ = ('get_async_session', 'get_async_generator_session')
+__all__ = ('get_async_session', 'get_async_read_session', 'get_async_generator_session', 'get_pool_stats', 'ReplicaMonitor')
 
 from src.database.database import (
     get_async_session,
+    get_async_read_session,
     get_async_generator_session,
-)
\ No newline at end of file
+    get_pool_stats,
+    ReplicaMonitor,
+)
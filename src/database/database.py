@@ -1,21 +1,157 @@
+import time
+import asyncio
 from typing import AsyncGenerator
 from contextlib import asynccontextmanager
 
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession, AsyncEngine
 
+from src.logger import logger
 from src.config import settings
+from src.database.pool import ObservedPool
 
 
-engine = create_async_engine(settings.build_postgres_url(), echo=False)
+def build_engine(url: str, pool_size: int, max_overflow: int) -> AsyncEngine:
+    """
+        Движок с настройками пула из AppSettings
+    """
+    return create_async_engine(
+        url,
+        echo=False,
+        poolclass=ObservedPool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.POSTGRES_POOL_TIMEOUT,
+        pool_recycle=settings.POSTGRES_POOL_RECYCLE,
+        pool_pre_ping=settings.POSTGRES_POOL_PRE_PING,
+        connect_args={'prepared_statement_cache_size': settings.POSTGRES_STATEMENT_CACHE_SIZE},
+    )
+
+
+engine = build_engine(
+    settings.build_postgres_url(),
+    settings.POSTGRES_POOL_SIZE,
+    settings.POSTGRES_MAX_OVERFLOW,
+)
 async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+# Реплика для запросов только на чтение
+read_engine = build_engine(
+    settings.build_postgres_url(host=settings.POSTGRES_READ_HOST, port=settings.POSTGRES_READ_PORT),
+    settings.POSTGRES_READ_POOL_SIZE,
+    settings.POSTGRES_READ_MAX_OVERFLOW,
+) if settings.POSTGRES_READ_HOST else None
+async_read_session_maker = async_sessionmaker(
+    read_engine, class_=AsyncSession, expire_on_commit=False,
+) if read_engine else None
+
+# Отставание реплики в секундах, 0 — все полученные WAL применены или это не реплика
+REPLICA_LAG = text(
+    "SELECT CASE "
+    "WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE extract(epoch FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+class ReplicaMonitor:
+    """
+        Доступность реплики для чтения
+
+        Фоновая задача проверяет реплику каждые POSTGRES_READ_CHECK_INTERVAL: недоступная или
+        отстающая больше POSTGRES_READ_MAX_LAG реплика заменяется основной БД. Запросы только
+        читают последний результат; устаревший результат (задача остановлена) считается недоступностью.
+    """
+    _available = False
+    _checked_at = float('-inf')
+    _task = None
+
+    @classmethod
+    def _is_fresh(cls) -> bool:
+        max_age = settings.POSTGRES_READ_CHECK_INTERVAL + settings.POSTGRES_READ_CHECK_TIMEOUT
+        return time.monotonic() - cls._checked_at < max_age
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """
+            Можно ли читать с реплики
+        """
+        return read_engine is not None and cls._available and cls._is_fresh()
+
+    @classmethod
+    def start(cls):
+        """
+            Запуск фоновой проверки реплики
+        """
+        if read_engine is None or cls._task is not None:
+            return
+        cls._task = asyncio.create_task(cls._run(), name='replica-monitor')
+
+    @classmethod
+    async def stop(cls):
+        """
+            Остановка фоновой проверки реплики
+        """
+        if cls._task is None:
+            return
+        cls._task.cancel()
+        await asyncio.gather(cls._task, return_exceptions=True)
+        cls._task = None
+        cls._available = False
+
+    @classmethod
+    async def _run(cls):
+        while True:
+            available = await cls._check()
+            if available != cls._available:
+                logger.info(f'Read replica is {"available" if available else "unavailable"}')
+            cls._available = available
+            cls._checked_at = time.monotonic()
+            await asyncio.sleep(settings.POSTGRES_READ_CHECK_INTERVAL)
+
+    @staticmethod
+    async def _check() -> bool:
+        """
+            Проверка соединения и отставания реплики
+        """
+        async def get_lag():
+            async with read_engine.connect() as connection:
+                return await connection.scalar(REPLICA_LAG)
+
+        try:
+            lag = await asyncio.wait_for(get_lag(), settings.POSTGRES_READ_CHECK_TIMEOUT)
+        except Exception as exc:
+            logger.error(f'Read replica check failed: {exc!r}')
+            return False
+        if lag is not None and lag > settings.POSTGRES_READ_MAX_LAG:
+            logger.error(f'Read replica lag is {lag:.1f} s')
+            return False
+        return True
+
 
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_maker() as session:
         yield session
 
 
+async def get_async_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+        Сессия для запросов только на чтение: реплика, если она доступна, иначе основная БД
+    """
+    session_maker = async_read_session_maker if ReplicaMonitor.is_available() else async_session_maker
+    async with session_maker() as session:
+        yield session
+
+
 @asynccontextmanager
 async def get_async_generator_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_maker() as session:
         yield session
+
+
+def get_pool_stats(read: bool = False) -> dict | None:
+    """
+        Диагностика пула соединений основной БД или реплики
+    """
+    if read:
+        return read_engine.pool.stats() if read_engine else None
+    return engine.pool.stats()
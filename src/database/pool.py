@@ -0,0 +1,70 @@
+import time
+import heapq
+from datetime import datetime, timezone
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.config import settings
+
+
+class ObservedPool(AsyncAdaptedQueuePool):
+    """
+        Пул соединений со счетчиками ожидания соединения
+
+        Время получения соединения из пула (включая открытие нового) учитывается
+        в общем и максимальном времени и в списке самых долгих ожиданий.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """
+            Инициализация
+        """
+        super().__init__(*args, **kwargs)
+        self.acquisitions = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.timeouts = 0
+        self._slowest: list[tuple[float, str]] = []
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            # Ошибки подключения (сеть, авторизация) не считаются ожиданием пула
+            self.timeouts += 1
+            raise
+        finally:
+            self._record_wait(time.perf_counter() - started)
+
+    def _record_wait(self, wait: float):
+        self.acquisitions += 1
+        self.wait_total += wait
+        self.wait_max = max(self.wait_max, wait)
+        item = (wait, datetime.now(timezone.utc).isoformat())
+        if len(self._slowest) < settings.POSTGRES_POOL_SLOWEST:
+            heapq.heappush(self._slowest, item)
+        elif wait > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, item)
+
+    def stats(self) -> dict:
+        """
+            Состояние пула и счетчики ожидания
+        """
+        return {
+            'pool_size': self.size(),
+            'max_overflow': self._max_overflow,
+            'checked_out': self.checkedout(),
+            'checked_in': self.checkedin(),
+            # До заполнения пула счетчик SQLAlchemy отрицательный
+            'overflow': max(self.overflow(), 0),
+            'acquisitions': self.acquisitions,
+            'timeouts': self.timeouts,
+            'wait_avg_ms': round(self.wait_total / self.acquisitions * 1000, 3) if self.acquisitions else 0.0,
+            'wait_max_ms': round(self.wait_max * 1000, 3),
+            'slowest': [
+                {'wait_ms': round(wait * 1000, 3), 'at': at}
+                for wait, at in sorted(self._slowest, reverse=True)
+            ],
+        }
@@ -3,7 +3,9 @@ __all__ = (
     'Cars',
     'Insurance',
     'InsuranceElt',
+    'EltDictionary',
+    'ImportJob',
 )
 
 from src.models.base_class import Base
-from src.models.models import InsuranceElt, Insurance, Cars
+from src.models.models import InsuranceElt, Insurance, Cars, EltDictionary, ImportJob
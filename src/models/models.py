@@ -1,12 +1,15 @@
 from sqlalchemy import (
+    text,
     Text,
     func,
+    Index,
     JSON,
     String,
     Integer,
     TIMESTAMP,
     BigInteger,
     ForeignKey,
+    UniqueConstraint,
 )
 from sqlalchemy.orm import mapped_column, relationship, Mapped
 
@@ -15,9 +18,13 @@ from src.models.base_class import Base
 
 class InsuranceElt(Base):
     __tablename__ = 'insurance_elt'
+    __table_args__ = (
+        # Котировки без ошибок по номеру расчета (get_all_insurance_accept)
+        Index('ix_insurance_elt_calc_id_accept', 'calc_id', postgresql_where=text('"Error" IS NULL')),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    insurance_id: Mapped[int] = mapped_column(BigInteger, ForeignKey('insurance.id'), nullable=False)
+    insurance_id: Mapped[int] = mapped_column(BigInteger, ForeignKey('insurance.id', ondelete='CASCADE'), index=True, nullable=False)
     calc_id: Mapped[int] = mapped_column(BigInteger, default=None, nullable=False)
     insurance_name: Mapped[str] = mapped_column(Text, nullable=False)
     RequestId: Mapped[str] = mapped_column(String)
@@ -56,12 +63,19 @@ class Insurance(Base):
     insurance_elts = relationship(
         "InsuranceElt",
         back_populates="insurance",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        # Котировки удаляет Postgres (ON DELETE CASCADE), без загрузки в сессию
+        passive_deletes=True,
     )
 
 
 class Cars(Base):
     __tablename__ = 'cars'
+    __table_args__ = (
+        # Ключ загрузки справочника, пустая модификация — тоже значение
+        UniqueConstraint('brand', 'model', 'modif', name='uq_cars_brand_model_modif',
+                         postgresql_nulls_not_distinct=True),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     brand: Mapped[str] = mapped_column(Text, nullable=True, default=None)
@@ -70,3 +84,36 @@ class Cars(Base):
     sk_brand: Mapped[str] = mapped_column(Text, nullable=True, default=None)
     sk_model: Mapped[str] = mapped_column(Text, nullable=True, default=None)
     type: Mapped[str] = mapped_column(String(5), nullable=True, default=None)
+
+
+# Поиск авто по марке и модели без учета регистра
+Index('ix_cars_lower_brand_lower_model', func.lower(Cars.brand), func.lower(Cars.model))
+
+
+class EltDictionary(Base):
+    __tablename__ = 'elt_dictionary'
+    __table_args__ = (
+        UniqueConstraint('method', 'params'),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    method: Mapped[str] = mapped_column(Text, nullable=False)
+    params: Mapped[str] = mapped_column(Text, nullable=False)
+    data: Mapped[dict] = mapped_column(JSON, nullable=False)
+    fetched_at: Mapped[str] = mapped_column(TIMESTAMP, server_default=func.now(), nullable=False)
+
+
+class ImportJob(Base):
+    __tablename__ = 'import_job'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    filename: Mapped[str] = mapped_column(Text, default=None, nullable=True)
+    status: Mapped[str] = mapped_column(String(16), default='pending', nullable=False)
+    rows_processed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    inserted: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    updated: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    skipped: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    errors: Mapped[list] = mapped_column(JSON, default=list, nullable=False)
+    created_at: Mapped[str] = mapped_column(TIMESTAMP, server_default=func.now(), nullable=False)
+    started_at: Mapped[str] = mapped_column(TIMESTAMP, default=None, nullable=True)
+    finished_at: Mapped[str] = mapped_column(TIMESTAMP, default=None, nullable=True)
@@ -1,7 +1,9 @@
 __all__ = (
     'elt_router',
     'excel_router',
+    'ops_router',
 )
 
 from src.routers.elt.route import router as elt_router
 from src.routers.excel.route import router as excel_router
+from src.routers.ops.route import router as ops_router
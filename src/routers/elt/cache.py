@@ -0,0 +1,143 @@
+import time
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class LoadCancelled(Exception):
+    """
+        Загрузка записи отменена у владельца запроса
+    """
+
+
+class TTLCache:
+    """
+        Кэш с временем жизни записей и вытеснением LRU
+
+        Потокобезопасен, одновременные промахи по одному ключу в event loop
+        объединяются в один запрос к источнику (single-flight).
+    """
+
+    def __init__(self, maxsize: int):
+        """
+            Инициализация
+        """
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.coalesced = 0
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        """
+            Получение записи: (найдено, значение)
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return False, None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return False, None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def set(self, key: Hashable, value: Any, ttl: float):
+        """
+            Сохранение записи
+        """
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """
+            Очистка кэша
+        """
+        with self._lock:
+            self._data.clear()
+
+    def remaining(self, key: Hashable) -> float | None:
+        """
+            Оставшееся время жизни записи (None — записи нет)
+        """
+        with self._lock:
+            item = self._data.get(key)
+        if item is None:
+            return None
+        return max(item[0] - time.monotonic(), 0.0)
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: float = None) -> Any:
+        """
+            Получение записи, при промахе — загрузка одним запросом на ключ
+
+            Без ttl loader возвращает (значение, время жизни). Если загружающий
+            запрос отменен, ожидающие не отменяются: один из них повторяет загрузку.
+        """
+        while True:
+            found, value = self.get(key)
+            if found:
+                return value
+
+            future = self._inflight.get(key)
+            if future is None:
+                return await self._load(key, loader, ttl)
+
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(future)
+            except LoadCancelled:
+                continue
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: float = None) -> Any:
+        """
+            Загрузка записи владельцем запроса
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+            if ttl is None:
+                value, value_ttl = value
+            else:
+                value_ttl = ttl
+        except BaseException as exc:
+            # Отмена владельца не передается ожидающим, они повторяют загрузку
+            future.set_exception(LoadCancelled() if isinstance(exc, asyncio.CancelledError) else exc)
+            # Исключение передается ожидающим, у владельца оно пробрасывается ниже
+            future.exception()
+            raise
+        else:
+            # None означает ошибку SOAP запроса, не кэшируем
+            if value is not None:
+                self.set(key, value, value_ttl)
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> dict:
+        """
+            Счетчики кэша
+        """
+        with self._lock:
+            size = len(self._data)
+        return {
+            'size': size,
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'coalesced': self.coalesced,
+        }
@@ -0,0 +1,113 @@
+import re
+from bisect import bisect_left
+
+# Сокращения и типы адресных объектов, не участвующие в сравнении названий
+ADDRESS_TYPES = {
+    'обл', 'область',
+    'г', 'город',
+    'респ', 'республика',
+    'край',
+    'ао', 'автономный', 'округ', 'аобл',
+    'р-н', 'район',
+    'пгт', 'поселок', 'рп',
+    'с', 'село',
+    'д', 'деревня',
+    'п', 'пос',
+    'ст-ца', 'станица',
+}
+
+_SEPARATORS = re.compile(r'[\s.,()«»"]+')
+
+
+def normalize_name(name: str) -> str:
+    """
+        Нормализация названия: регистр, ё/е, сокращения типов («обл.», «г.»)
+    """
+    name = name.casefold().replace('ё', 'е')
+    tokens = [token.strip('-') for token in _SEPARATORS.split(name)]
+    return ' '.join(token for token in tokens if token and token not in ADDRESS_TYPES)
+
+
+class KladrIndex:
+    """
+        Индекс КЛАДР регионов и городов
+
+        Строится один раз из GetRegionsExt/GetCitiesExt, поиск по точному
+        совпадению нормализованного названия и по префиксу любого слова.
+    """
+    REGION = 'region'
+    CITY = 'city'
+
+    def __init__(self, regions: list[dict], cities: dict[str, list[dict]]):
+        """
+            Построение индекса
+        """
+        self.items = []
+        self._exact: dict[str, list[int]] = {}
+        prefix = []
+
+        def add(item: dict, kind: str, region_id: str = None):
+            position = len(self.items)
+            self.items.append({
+                'Id': item.get('Id'),
+                'Name': item.get('Name'),
+                'Kladr': item.get('Kladr'),
+                'RegionId': region_id,
+                'Type': kind,
+            })
+            key = normalize_name(item.get('Name') or '')
+            self._exact.setdefault(key, []).append(position)
+            # Префиксы по каждому слову: «новгород» находит «Нижний Новгород»
+            tokens = key.split(' ')
+            for index in range(len(tokens)):
+                prefix.append((' '.join(tokens[index:]), position))
+
+        for region in regions:
+            add(region, self.REGION, region.get('Id'))
+        for region_id, region_cities in cities.items():
+            for city in region_cities:
+                add(city, self.CITY, region_id)
+
+        prefix.sort()
+        self._prefix_keys = [key for key, _ in prefix]
+        self._prefix_positions = [position for _, position in prefix]
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def lookup(self, name: str, region_id: str = None, kind: str = None, limit: int = 20) -> list[dict]:
+        """
+            Поиск: сначала точные совпадения, затем по префиксу
+        """
+        key = normalize_name(name)
+        if not key:
+            return []
+
+        positions = list(self._exact.get(key, []))
+        start = bisect_left(self._prefix_keys, key)
+        for index in range(start, len(self._prefix_keys)):
+            if not self._prefix_keys[index].startswith(key):
+                break
+            positions.append(self._prefix_positions[index])
+
+        result, seen = [], set()
+        for position in positions:
+            if position in seen:
+                continue
+            seen.add(position)
+            item = self.items[position]
+            if region_id is not None and item['RegionId'] != region_id:
+                continue
+            if kind is not None and item['Type'] != kind:
+                continue
+            result.append(item)
+            if len(result) >= limit:
+                break
+        return result
+
+    def find_region(self, name: str) -> dict | None:
+        """
+            Поиск региона по названию
+        """
+        result = self.lookup(name, kind=self.REGION, limit=1)
+        return result[0] if result else None
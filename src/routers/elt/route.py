@@ -1,13 +1,17 @@
+import json
+
 from zeep.helpers import serialize_object
-from fastapi import APIRouter, status, Depends
+from fastapi import APIRouter, status, Depends, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.config import settings
-from src.database import get_async_session
+from src.database import get_async_session, get_async_read_session, get_async_generator_session
 from src.schemas import schemas as global_schemas
 from src.routers.elt import schemas, utils, services
 from src.routers.excel import (
-    services as car_services,
+    utils as car_utils,
 )
 from src.exceptions import exceptions as global_exceptions
 
@@ -17,226 +21,193 @@ router = APIRouter(prefix='/elt', tags=['elt'])
             status_code=status.HTTP_200_OK,
             response_model=list[str],
             description='Метод получения списка марок ТС')
-def casco_get_marks():
+async def casco_get_marks():
     """
         Get marks service
     """
     elt_username, elt_password = settings.ELT_USERNAME, settings.ELT_PASSWORD.get_secret_value()
 
-    soap = utils.SoapService(elt_username, elt_password)
-    client = soap.get_client(elt_username, elt_password)
+    soap = utils.SoapServiceAsync(elt_username, elt_password)
+    client = await soap.get_client()
 
-    try:
-        return soap.get_insurance_brand_values(client)
-    finally:
-        soap.close()
+    return await soap.get_insurance_brand_values(client)
 
 
 @router.get(path='/casco-get-mark',
             status_code=status.HTTP_200_OK,
             response_model=list[str],
             description='Метод получения списка моделей ТС по марке')
-def casco_get_mark(mark_name: str):
+async def casco_get_mark(mark_name: str):
     """
         Get mark service
     """
     elt_username, elt_password = settings.ELT_USERNAME, settings.ELT_PASSWORD.get_secret_value()
 
-    soap = utils.SoapService(elt_username, elt_password)
-    client = soap.get_client(elt_username, elt_password)
+    soap = utils.SoapServiceAsync(elt_username, elt_password)
+    client = await soap.get_client()
 
-    try:
-        return soap.get_insurance_model_values(client, mark_name)
-    finally:
-        soap.close()
+    return await soap.get_insurance_model_values(client, mark_name)
 
 
 @router.get(path='/casco-get-modification-ts',
             status_code=status.HTTP_200_OK,
             response_model=schemas.ModificationResponse,
             description='Метод получения списка модификаций ТС по марке и модели')
-def casco_get_modification_ts(mark_name: str, model_name: str):
+async def casco_get_modification_ts(mark_name: str, model_name: str):
     """
         Get modification service
     """
     elt_username, elt_password = settings.ELT_USERNAME, settings.ELT_PASSWORD.get_secret_value()
 
-    soap = utils.SoapService(elt_username, elt_password)
-    client = soap.get_client(elt_username, elt_password)
+    soap = utils.SoapServiceAsync(elt_username, elt_password)
+    client = await soap.get_client()
 
-    try:
-        result = soap.get_modification_ts(client, mark_name, model_name)
-        car_models = [schemas.Car(**serialize_object(car)) for car in result]
-        return schemas.ModificationResponse(cars=car_models)
-    finally:
-        soap.close()
+    result = await soap.get_modification_ts(client, mark_name, model_name)
+    car_models = [schemas.Car(**serialize_object(car)) for car in result]
+    return schemas.ModificationResponse(cars=car_models)
 
 
 @router.get('/casco-get-banks',
             status_code=status.HTTP_200_OK,
             response_model=schemas.BankResponse,
             description='Метод получения списка Банков')
-def casco_get_banks():
+async def casco_get_banks():
     """
         Get banks service
     """
     elt_username, elt_password = settings.ELT_USERNAME, settings.ELT_PASSWORD.get_secret_value()
 
-    soap = utils.SoapService(elt_username, elt_password)
-    client = soap.get_client(elt_username, elt_password)
+    soap = utils.SoapServiceAsync(elt_username, elt_password)
+    client = await soap.get_client()
 
-    try:
-        result = soap.get_banks(client)
-        bank_models = [schemas.Bank(**serialize_object(bank)) for bank in result]
-        return schemas.BankResponse(banks=bank_models)
-    finally:
-        soap.close()
+    result = await soap.get_banks(client)
+    bank_models = [schemas.Bank(**serialize_object(bank)) for bank in result]
+    return schemas.BankResponse(banks=bank_models)
 
 
 @router.get(path='/casco-get-do',
             status_code=status.HTTP_200_OK,
             response_model=schemas.DoResponse,
             description='Метод получения типов ДО')
-def casco_get_do():
+async def casco_get_do():
     """
         Get DO service
     """
     elt_username, elt_password = settings.ELT_USERNAME, settings.ELT_PASSWORD.get_secret_value()
 
-    soap = utils.SoapService(elt_username, elt_password)
-    client = soap.get_client(elt_username, elt_password)
+    soap = utils.SoapServiceAsync(elt_username, elt_password)
+    client = await soap.get_client()
 
-    try:
-        result = soap.get_do(client)
-        do_models = [schemas.Do(**serialize_object(do)) for do in result]
-        return schemas.DoResponse(do=do_models)
-    finally:
-        soap.close()
+    result = await soap.get_do(client)
+    do_models = [schemas.Do(**serialize_object(do)) for do in result]
+    return schemas.DoResponse(do=do_models)
 
 
 @router.get(path='/casco-get-opf',
             status_code=status.HTTP_200_OK,
             response_model=schemas.OpfResponse,
             description='Метод получения справочника ОПФ')
-def casco_get_opf():
+async def casco_get_opf():
     """
         Get Opf Service
     """
     elt_username, elt_password = settings.ELT_USERNAME, settings.ELT_PASSWORD.get_secret_value()
 
-    soap = utils.SoapService(elt_username, elt_password)
-    client = soap.get_client(elt_username, elt_password)
+    soap = utils.SoapServiceAsync(elt_username, elt_password)
+    client = await soap.get_client()
 
-    try:
-        result = soap.get_opf(client)
-        opf_models = [schemas.Opf(**serialize_object(opf)) for opf in result]
-        return schemas.OpfResponse(opf=opf_models)
-    finally:
-        soap.close()
+    result = await soap.get_opf(client)
+    opf_models = [schemas.Opf(**serialize_object(opf)) for opf in result]
+    return schemas.OpfResponse(opf=opf_models)
 
 
 @router.get(path='/casco-get-list-sk',
             status_code=status.HTTP_200_OK,
             response_model=schemas.InsuranceCompaniesResponse,
             description='Метод получения списка СК')
-def casco_get_list_sk():
+async def casco_get_list_sk():
     """
         Get List SK Service
     """
     elt_username, elt_password = settings.ELT_USERNAME, settings.ELT_PASSWORD.get_secret_value()
 
-    soap = utils.SoapService(elt_username, elt_password)
-    client = soap.get_client(elt_username, elt_password)
+    soap = utils.SoapServiceAsync(elt_username, elt_password)
+    client = await soap.get_client()
 
-    try:
-        result = soap.get_list_sk(client, elt_username)
-        company_models = [schemas.InsuranceCompanies(**serialize_object(company)) for company in result]
-        return schemas.InsuranceCompaniesResponse(companies=company_models)
-    finally:
-        soap.close()
+    result = await soap.get_list_sk(client, elt_username)
+    company_models = [schemas.InsuranceCompanies(**serialize_object(company)) for company in result]
+    return schemas.InsuranceCompaniesResponse(companies=company_models)
 
 
 @router.get(path='/casco-get-options-characteristic',
             status_code=status.HTTP_200_OK,
             response_model=schemas.InsuranceCompanyOptionsResponse,
             description='Метод получения списка опций, характерных для конкретной СК')
-def casco_get_options_characteristic(company_id: str):
+async def casco_get_options_characteristic(company_id: str):
     """
         Get Options Characteristics
     """
     elt_username, elt_password = settings.ELT_USERNAME, settings.ELT_PASSWORD.get_secret_value()
 
-    soap = utils.SoapService(elt_username, elt_password)
-    client = soap.get_client(elt_username, elt_password)
+    soap = utils.SoapServiceAsync(elt_username, elt_password)
+    client = await soap.get_client()
 
-    try:
-        result = soap.get_options_characteristic(client, company_id)
-        return schemas.InsuranceCompanyOptionsResponse(**serialize_object(result))
-    finally:
-        soap.close()
+    result = await soap.get_options_characteristic(client, company_id)
+    return schemas.InsuranceCompanyOptionsResponse(**serialize_object(result))
 
 
 @router.get(path='/casco-get-products-sk',
             status_code=status.HTTP_200_OK,
             response_model=schemas.ListProductsResponse,
             description='Метод получения списка продуктов СК')
-def casco_get_products_sk(company_id: str):
+async def casco_get_products_sk(company_id: str):
     """
         Get Products SK Service
     """
     elt_username, elt_password = settings.ELT_USERNAME, settings.ELT_PASSWORD.get_secret_value()
 
-    soap = utils.SoapService(elt_username, elt_password)
-    client = soap.get_client(elt_username, elt_password)
+    soap = utils.SoapServiceAsync(elt_username, elt_password)
+    client = await soap.get_client()
 
-    try:
-        result = soap.get_list_products_sk(client, company_id)
-        product_models = [schemas.Product(**serialize_object(product)) for product in result]
-        return schemas.ListProductsResponse(products=product_models)
-    finally:
-        soap.close()
+    result = await soap.get_list_products_sk(client, company_id)
+    product_models = [schemas.Product(**serialize_object(product)) for product in result]
+    return schemas.ListProductsResponse(products=product_models)
 
 
 @router.get(path='/casco-get-programs-sk',
             status_code=status.HTTP_200_OK,
             response_model=schemas.ListProgramsResponse,
             description='Метод получения списка программ СК')
-def casco_get_programs_sk(company_id: str, product: str = None):
+async def casco_get_programs_sk(company_id: str, product: str = None):
     """
         Get Programs SK Service
     """
     elt_username, elt_password = settings.ELT_USERNAME, settings.ELT_PASSWORD.get_secret_value()
 
-    soap = utils.SoapService(elt_username, elt_password)
-    client = soap.get_client(elt_username, elt_password)
+    soap = utils.SoapServiceAsync(elt_username, elt_password)
+    client = await soap.get_client()
 
-    try:
-        result = soap.get_list_programs_sk(client, company_id, product)
-        program_models = [schemas.Program(**serialize_object(program)) for program in result]
-        return schemas.ListProgramsResponse(programs=program_models)
-    finally:
-        soap.close()
+    result = await soap.get_list_programs_sk(client, company_id, product)
+    program_models = [schemas.Program(**serialize_object(program)) for program in result]
+    return schemas.ListProgramsResponse(programs=program_models)
 
 
 @router.get(path='/casco-get-puu-marks',
             status_code=status.HTTP_200_OK,
             response_model=schemas.ListPuuMarksResponse,
             description='Метод получения списка марок ПУУ')
-def casco_get_puu_marks():
+async def casco_get_puu_marks():
     """
         Get PUU Marks Service
     """
     elt_username, elt_password = settings.ELT_USERNAME, settings.ELT_PASSWORD.get_secret_value()
 
-    soap = utils.SoapService(elt_username, elt_password)
-    client = soap.get_client(elt_username, elt_password)
+    soap = utils.SoapServiceAsync(elt_username, elt_password)
+    client = await soap.get_client()
 
-    try:
-        result = soap.get_list_puu_marks(client)
-        puu_mark_models = [schemas.PuuMark(**serialize_object(puu_mark)) for puu_mark in result]
-        return schemas.ListPuuMarksResponse(puu_marks=puu_mark_models)
-    finally:
-        soap.close()
+    result = await soap.get_list_puu_marks(client)
+    puu_mark_models = [schemas.PuuMark(**serialize_object(puu_mark)) for puu_mark in result]
+    return schemas.ListPuuMarksResponse(puu_marks=puu_mark_models)
 
 
 @router.get(path='/casco-get-puu-models',
@@ -256,208 +227,227 @@ def casco_get_puu_marks():
             },
             response_model=schemas.ListPuuModelsResponse,
             description='Метод получения моделей ПУУ по марке')
-def casco_get_puu_models_by_mark_id(mark_id: str):
+async def casco_get_puu_models_by_mark_id(mark_id: str):
     """
         Get PUU Models By Mark Service
     """
     elt_username, elt_password = settings.ELT_USERNAME, settings.ELT_PASSWORD.get_secret_value()
 
-    soap = utils.SoapService(elt_username, elt_password)
-    client = soap.get_client(elt_username, elt_password)
+    soap = utils.SoapServiceAsync(elt_username, elt_password)
+    client = await soap.get_client()
 
-    try:
-        result = soap.get_list_models_puu_by_mark(client, mark_id)
-        if result:
-            puu_models = [schemas.PuuModel(**serialize_object(puu_model)) for puu_model in result]
-            return schemas.ListPuuModelsResponse(puu_models=puu_models)
+    result = await soap.get_list_models_puu_by_mark(client, mark_id)
+    if result:
+        puu_models = [schemas.PuuModel(**serialize_object(puu_model)) for puu_model in result]
+        return schemas.ListPuuModelsResponse(puu_models=puu_models)
 
-        raise global_exceptions.MyHTTPException(
-            status=global_schemas.StatusResponseEnum.ERROR,
-            status_code=status.HTTP_404_NOT_FOUND,
-            message='Модель не найдена',
-        )
-    finally:
-        soap.close()
+    raise global_exceptions.MyHTTPException(
+        status=global_schemas.StatusResponseEnum.ERROR,
+        status_code=status.HTTP_404_NOT_FOUND,
+        message='Модель не найдена',
+    )
 
 
 @router.get(path='/casco-get-ref-info',
             status_code=status.HTTP_200_OK,
             response_model=schemas.RefInfoResponse,
             description='Метод получения справочной информации')
-def casco_get_ref_info():
+async def casco_get_ref_info():
     """
         Get Reference information Service
     """
     elt_username, elt_password = settings.ELT_USERNAME, settings.ELT_PASSWORD.get_secret_value()
 
-    soap = utils.SoapService(elt_username, elt_password)
-    client = soap.get_client(elt_username, elt_password)
+    soap = utils.SoapServiceAsync(elt_username, elt_password)
+    client = await soap.get_client()
 
-    try:
-        result = soap.get_ref_info(client)
-        ref_info_models = [schemas.RefInfo(**serialize_object(ref_info)) for ref_info in result]
-        return schemas.RefInfoResponse(ref_info=ref_info_models)
-    finally:
-        soap.close()
+    result = await soap.get_ref_info(client)
+    ref_info_models = [schemas.RefInfo(**serialize_object(ref_info)) for ref_info in result]
+    return schemas.RefInfoResponse(ref_info=ref_info_models)
 
 
 @router.get(path='/casco-get-kladr-regions',
             status_code=status.HTTP_200_OK,
             response_model=schemas.KladrRegionResponse,
             description='Метод получения идентификатора, КЛАДРа с полным наименованием регионов')
-def casco_get_kladr_regions():
+async def casco_get_kladr_regions():
     """
         Get Kladr Regions Service
     """
     elt_username, elt_password = settings.ELT_USERNAME, settings.ELT_PASSWORD.get_secret_value()
 
-    soap = utils.SoapService(elt_username, elt_password)
-    client = soap.get_client(elt_username, elt_password)
+    soap = utils.SoapServiceAsync(elt_username, elt_password)
+    client = await soap.get_client()
 
-    try:
-        result = soap.get_full_kladr_regions(client)
-        kladr_regions_models = [schemas.KladrRegion(**serialize_object(kladr_region)) for kladr_region in result]
-        return schemas.KladrRegionResponse(regions=kladr_regions_models)
-    finally:
-        soap.close()
+    result = await soap.get_full_kladr_regions(client)
+    kladr_regions_models = [schemas.KladrRegion(**serialize_object(kladr_region)) for kladr_region in result]
+    return schemas.KladrRegionResponse(regions=kladr_regions_models)
 
 
 @router.get(path='/casco-get-kladr-cities',
             status_code=status.HTTP_200_OK,
             response_model=schemas.KladrCitiesResponse,
             description='Метод получения идентификатора, КЛАДРа города/населённого пункта')
-def casco_get_kladr_cities(region_id: str):
+async def casco_get_kladr_cities(region_id: str):
     """
         Get Kladr Cities Service
     """
     elt_username, elt_password = settings.ELT_USERNAME, settings.ELT_PASSWORD.get_secret_value()
 
-    soap = utils.SoapService(elt_username, elt_password)
-    client = soap.get_client(elt_username, elt_password)
+    soap = utils.SoapServiceAsync(elt_username, elt_password)
+    client = await soap.get_client()
+
+    result = await soap.get_full_kladr_cities(client, region_id)
+    kladr_cities_models = [schemas.KladrCity(**serialize_object(kladr_city)) for kladr_city in result]
+    return schemas.KladrCitiesResponse(cities=kladr_cities_models)
+
+@router.get(path='/casco-search-kladr',
+            status_code=status.HTTP_200_OK,
+            response_model=schemas.KladrSearchResponse,
+            description='Метод поиска КЛАДРа региона/города по названию (точное совпадение, затем по префиксу)')
+async def casco_search_kladr(name: str, region_id: str = None, type_: str = Query(None, alias='type'), limit: int = 20):
+    """
+        Search Kladr Service
+    """
+    elt_username, elt_password = settings.ELT_USERNAME, settings.ELT_PASSWORD.get_secret_value()
+
+    soap = utils.SoapServiceAsync(elt_username, elt_password)
+    index = await soap.get_kladr_index()
+
+    items = index.lookup(name, region_id=region_id, kind=type_, limit=limit)
+    return schemas.KladrSearchResponse(items=[schemas.KladrSearchItem(**item) for item in items])
 
-    try:
-        result = soap.get_full_kladr_cities(client, region_id)
-        kladr_cities_models = [schemas.KladrCity(**serialize_object(kladr_city)) for kladr_city in result]
-        return schemas.KladrCitiesResponse(cities=kladr_cities_models)
-    finally:
-        soap.close()
 
 @router.get(path='/casco-get-kladr-countries',
             status_code=status.HTTP_200_OK,
             response_model=schemas.CountriesResponse,
             description='Метод получения списка стран')
-def casco_get_countries():
+async def casco_get_countries():
     """
         Get Countries Service
     """
     elt_username, elt_password = settings.ELT_USERNAME, settings.ELT_PASSWORD.get_secret_value()
 
-    soap = utils.SoapService(elt_username, elt_password)
-    client = soap.get_client(elt_username, elt_password)
+    soap = utils.SoapServiceAsync(elt_username, elt_password)
+    client = await soap.get_client()
 
-    try:
-        result = soap.get_full_kladr_countries(client)
-        countries = [schemas.Country(**serialize_object(country)) for country in result]
-        return schemas.CountriesResponse(countries=countries)
-    finally:
-        soap.close()
+    result = await soap.get_full_kladr_countries(client)
+    countries = [schemas.Country(**serialize_object(country)) for country in result]
+    return schemas.CountriesResponse(countries=countries)
 
 
 @router.get(path='/casco-get-stoa',
             status_code=status.HTTP_200_OK,
             response_model=schemas.StoaResponse,
             description='Получения вариантов возмещений')
-def casco_get_soa():
+async def casco_get_soa():
     """
         Get Stoa Service
     """
     elt_username, elt_password = settings.ELT_USERNAME, settings.ELT_PASSWORD.get_secret_value()
 
-    soap = utils.SoapService(elt_username, elt_password)
-    client = soap.get_client(elt_username, elt_password)
+    soap = utils.SoapServiceAsync(elt_username, elt_password)
+    client = await soap.get_client()
 
-    try:
-        result = soap.get_stoa(client)
-        stoa = [schemas.Stoa(**serialize_object(stoa)) for stoa in result]
-        return schemas.StoaResponse(stoa=stoa)
-    finally:
-        soap.close()
+    result = await soap.get_stoa(client)
+    stoa = [schemas.Stoa(**serialize_object(stoa)) for stoa in result]
+    return schemas.StoaResponse(stoa=stoa)
 
 
 @router.get(path='/casco-get-go-limit',
             status_code=status.HTTP_200_OK,
             response_model=schemas.GoLimitResponse,
             description='Метод получения страховых сумм СК по риску Расширению ГО')
-def get_go_limit(company_id: str):
+async def get_go_limit(company_id: str):
     """
         Get Go Limit Service
     """
     elt_username, elt_password = settings.ELT_USERNAME, settings.ELT_PASSWORD.get_secret_value()
 
-    soap = utils.SoapService(elt_username, elt_password)
-    client = soap.get_client(elt_username, elt_password)
+    soap = utils.SoapServiceAsync(elt_username, elt_password)
+    client = await soap.get_client()
 
-    try:
-        result = soap.get_go_limit(client, company_id)
-        go_limit = [schemas.GoLimit(**serialize_object(limit)) for limit in result]
-        return schemas.GoLimitResponse(go_limit=go_limit)
-    finally:
-        soap.close()
+    result = await soap.get_go_limit(client, company_id)
+    go_limit = [schemas.GoLimit(**serialize_object(limit)) for limit in result]
+    return schemas.GoLimitResponse(go_limit=go_limit)
 
 @router.get(path='/casco-get-franchise',
             status_code=status.HTTP_200_OK,
             response_model=schemas.FranchiseResponse,
             description='Получение Франшизы')
-def get_franchise():
+async def get_franchise():
     """
         Get Franchise Service
     """
     username, password = settings.ELT_USERNAME, settings.ELT_PASSWORD.get_secret_value()
-    elt_soap = utils.SoapService(username, password)
-    client = elt_soap.get_client(username, password)
-    try:
-        result = elt_soap.get_types(client, 'Franchise')
-        franchises = [schemas.Franchise(**serialize_object(item)) for item in result]
-        return schemas.FranchiseResponse(franchises=franchises)
-    finally:
-        elt_soap.close()
+    elt_soap = utils.SoapServiceAsync(username, password)
+    client = await elt_soap.get_client()
+
+    result = await elt_soap.get_types(client, 'Franchise')
+    franchises = [schemas.Franchise(**serialize_object(item)) for item in result]
+    return schemas.FranchiseResponse(franchises=franchises)
 
 
 @router.get(path='/casco-get-ss-type',
             status_code=status.HTTP_200_OK,
             response_model=schemas.SSTypeResponse,
             description='Получение Тип Страховой по риску ущерб')
-def get_ss_type():
+async def get_ss_type():
     """
         Get SSType Service
     """
     username, password = settings.ELT_USERNAME, settings.ELT_PASSWORD.get_secret_value()
-    elt_soap = utils.SoapService(username, password)
-    client = elt_soap.get_client(username, password)
-    try:
-        result = elt_soap.get_types(client, 'SSType')
-        ss_types = [schemas.SSType(**serialize_object(item)) for item in result]
-        return schemas.SSTypeResponse(ss_types=ss_types)
-    finally:
-        elt_soap.close()
+    elt_soap = utils.SoapServiceAsync(username, password)
+    client = await elt_soap.get_client()
+
+    result = await elt_soap.get_types(client, 'SSType')
+    ss_types = [schemas.SSType(**serialize_object(item)) for item in result]
+    return schemas.SSTypeResponse(ss_types=ss_types)
+
+
+@router.get(path='/casco-get-options',
+            status_code=status.HTTP_200_OK,
+            response_model=schemas.OptionsResponse,
+            description='Получение значений справочной информации по списку типов, '
+                        'например ?ids=Franchise,SSType,KPPType (без ids — все типы)')
+async def get_options(ids: str = None):
+    """
+        Get Options Service
+    """
+    username, password = settings.ELT_USERNAME, settings.ELT_PASSWORD.get_secret_value()
+    elt_soap = utils.SoapServiceAsync(username, password)
+    client = await elt_soap.get_client()
+
+    options_index = await elt_soap.get_options_index(client)
+    keys = [key.strip() for key in ids.split(',') if key.strip()] if ids else list(options_index)
+    return schemas.OptionsResponse(options={key: options_index.get(key) or [] for key in keys})
+
+
+@router.get(path='/cache-stats',
+            status_code=status.HTTP_200_OK,
+            response_model=schemas.CacheStatsResponse,
+            description='Счетчики кэша справочников ELT или расчетов СК')
+async def get_cache_stats(calculations: bool = False):
+    """
+        Get Cache Stats Service: справочники или расчеты СК (calculations)
+    """
+    cache = utils.EltService._results if calculations else utils.SoapServiceAsync._cache
+    return schemas.CacheStatsResponse(**cache.stats())
 
 
 @router.get(path='/casco-get-print-forms',
             status_code=status.HTTP_200_OK,
             description='Методы получения печатных форм')
-def get_print_forms(order_id: str):
+async def get_print_forms(order_id: str):
     """
         Get Print Forms Service
     """
     elt_username, elt_password = settings.ELT_USERNAME, settings.ELT_PASSWORD.get_secret_value()
 
-    soap = utils.SoapService(elt_username, elt_password)
-    client = soap.get_client(elt_username, elt_password)
+    soap = utils.SoapServiceAsync(elt_username, elt_password)
+    client = await soap.get_client()
 
-    try:
-        return soap.get_available_print_forms(client, order_id)
-    finally:
-        soap.close()
+    return await soap.get_available_print_forms(client, order_id)
 
 
 @router.post(path='/casco-calculation',
@@ -487,13 +477,39 @@ def get_print_forms(order_id: str):
                 },
              },
              description='Метод получения предварительного расчета Спецтехники')
-async def casco_calculation_service(data: schemas.EltCascoCalculation, session: AsyncSession = Depends(get_async_session)):
+async def casco_calculation_service(data: schemas.EltCascoCalculation,
+                                    session: AsyncSession = Depends(get_async_session)):
     """
         Casco calculation service
     """
 
     # Установка Модели и Бренда
-    result = await car_services.find_car_info(data.Mark, data.Model, session)
+    result = await car_utils.CarsCatalog.find_car_info(data.Mark, data.Model)
+    if result:
+        data.Mark = result.get('brand')
+        data.Model = result.get('model')
+
+    method = 'PreliminaryKASKOCalculation'
+    cache_id = 'preliminary_casco_calculation'
+
+    username, password = settings.ELT_USERNAME, settings.ELT_PASSWORD.get_secret_value()
+    elt_soap = utils.EltService(username, password)
+    return await elt_soap.casco_calculation(method, cache_id, data, session)
+
+
+@router.post(path='/casco-calculation-stream',
+             status_code=status.HTTP_200_OK,
+             response_class=StreamingResponse,
+             description='Метод получения предварительного расчета Спецтехники с выдачей результата каждой СК '
+                         'по мере ответа (NDJSON). Последнее событие содержит котировку Ресо-Гарантии '
+                         'и статус сохранения')
+async def casco_calculation_stream_service(data: schemas.EltCascoCalculation):
+    """
+        Casco calculation stream service
+    """
+
+    # Установка Модели и Бренда
+    result = await car_utils.CarsCatalog.find_car_info(data.Mark, data.Model)
     if result:
         data.Mark = result.get('brand')
         data.Model = result.get('model')
@@ -504,33 +520,35 @@ async def casco_calculation_service(data: schemas.EltCascoCalculation, session:
     username, password = settings.ELT_USERNAME, settings.ELT_PASSWORD.get_secret_value()
     elt_soap = utils.EltService(username, password)
 
-    # Получаем клиент ELT
+    # Получаем клиент ELT до начала ответа, ошибка подключения вернется обычным ответом
     await elt_soap.get_client()
 
-    # Получаем Клиент Ресо Гарантии
-    elt_soap.get_client_reso_guarantee()
+    async def stream():
+        # Сессия зависимости закрывается до отправки потока, поэтому открываем свою
+        async with get_async_generator_session() as stream_session:
+            async for event in elt_soap.casco_calculation_stream(method, cache_id, data, stream_session):
+                yield json.dumps(jsonable_encoder(event), ensure_ascii=False) + '\n'
 
-    try:
-        return await elt_soap.casco_calculation(method, cache_id, data, session)
-    finally:
-        await elt_soap.close()
-        elt_soap.close_reso_guarantee()
+    return StreamingResponse(stream(), media_type='application/x-ndjson')
 
 
 @router.post(path='/reso-guarantee-rl-actions',
              status_code=status.HTTP_200_OK,
              description='Отправка в Ресо Гарантия Котировок')
-async def casco_reso_guarantee(data: schemas.ResoGuaranteeCreate, session: AsyncSession = Depends(get_async_session)):
+async def casco_reso_guarantee(data: schemas.ResoGuaranteeCreate,
+                               session: AsyncSession = Depends(get_async_session),
+                               read_session: AsyncSession = Depends(get_async_read_session)):
     """
         Casco Reso Guarantee Service
     """
 
     username, password = settings.RESO_GUARANTEE_USERNAME, settings.RESO_GUARANTEE_PASSWORD.get_secret_value()
-    guarantee_soap = utils.ResoGuarantee(username, password)
-    guarantee_soap.get_client()
+    guarantee_soap = utils.ResoGuaranteeAsync(username, password)
 
-    # Получение компаний
-    companies = await services.get_all_insurance_accept(data.calc_id, session)
+    # Получение компаний: расчет мог еще не дойти до реплики, тогда читаем основную БД
+    companies = await services.get_all_insurance_accept(data.calc_id, read_session)
+    if not companies and read_session.bind is not session.bind:
+        companies = await services.get_all_insurance_accept(data.calc_id, session)
     companies = [
         {
             'InsuranceCompany': company.insurance_name,
@@ -540,24 +558,17 @@ async def casco_reso_guarantee(data: schemas.ResoGuaranteeCreate, session: Async
         for company in companies
     ]
 
-    try:
-        return await guarantee_soap.get_rl_actions(data, companies, session)
-    finally:
-        guarantee_soap.close()
+    rl_actions_data = await guarantee_soap.get_rl_actions(data, companies, session)
+    return schemas.QuoteResponse(quote_id=rl_actions_data.get('quote_id'))
 
 
 @router.post(path='/reso-guarantee-rl-status',
              description='Получение премии по Квоте')
-def casco_reso_guarantee_check_status(quote_id: int):
+async def casco_reso_guarantee_check_status(quote_id: int):
     """
         Casco Reso Guarantee Check by Quote Service
     """
 
     username, password = settings.RESO_GUARANTEE_USERNAME, settings.RESO_GUARANTEE_PASSWORD.get_secret_value()
-    guarantee_soap = utils.ResoGuarantee(username, password)
-    guarantee_soap.get_client()
-
-    try:
-        return guarantee_soap.get_rl_status(quote_id)
-    finally:
-        guarantee_soap.close()
+    guarantee_soap = utils.ResoGuaranteeAsync(username, password)
+    return await guarantee_soap.get_rl_status(quote_id)
@@ -1,3 +1,4 @@
+from enum import Enum
 from typing import List, Optional, Any
 
 from pydantic import BaseModel
@@ -13,6 +14,16 @@ class UtilsOption(BaseModel):
     Name: str
 
 
+class CalculationOutcomeEnum(str, Enum):
+    """
+        Итог запроса расчета в СК
+    """
+    COMPLETED: str = 'completed'
+    HEDGED:    str = 'hedged'
+    TIMEOUT:   str = 'timeout'
+    ERROR:     str = 'error'
+
+
 # ================================================================================================================== #
 # ========================================================= Request ================================================ #
 # ================================================================================================================== #
@@ -103,6 +114,8 @@ class EltCascoCalculation(BaseModel):
     # Калькулятор ID
     calc_reso_id: int
     active_companies: list[str]
+    # Не брать расчеты СК из кэша
+    force_refresh: bool = False
 
 
 class Car(BaseModel):
@@ -262,6 +275,15 @@ class KladrCity(UtilsOption):
     Kladr: str
 
 
+class KladrSearchItem(KladrCity):
+    RegionId: Optional[str] = None
+    Type: str
+
+
+class KladrSearchResponse(BaseModel):
+    items: list[KladrSearchItem]
+
+
 class KladrRegionResponse(BaseModel):
     regions: list[KladrRegion]
 
@@ -306,5 +328,18 @@ class SSTypeResponse(BaseModel):
     ss_types: list[SSType]
 
 
+class OptionsResponse(BaseModel):
+    options: dict[str, list[UtilsOption]]
+
+
 class QuoteResponse(BaseModel):
     quote_id: int
+
+
+class CacheStatsResponse(BaseModel):
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+    evictions: int
+    coalesced: int
@@ -1,15 +1,10 @@
-from sqlalchemy import select, exists, update, null
+from sqlalchemy import select, update, delete, null, func
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.logger import logger
-from src.models import InsuranceElt, Insurance
-
-
-async def check_exist_insurance(calc_reso_id: int, session: AsyncSession):
-    result = await session.execute(
-        select(exists(Insurance.id).where(Insurance.calc_reso_id == calc_reso_id))
-    )
-    return result.scalar()
+from src.models import InsuranceElt, Insurance, EltDictionary
+from src.schemas import schemas as global_schemas
 
 
 async def get_all_insurance_accept(calc_id: int, session: AsyncSession):
@@ -27,49 +22,84 @@ async def get_all_insurance_accept(calc_id: int, session: AsyncSession):
     return result.scalars().all()
 
 
+def build_insurance_elts(calc_id: int, insurance_id: int, data: list) -> list[dict]:
+    """
+        Строки insurance_elt по результатам расчета
+
+        Тайм-ауты и ошибки запроса (только {'message': ...}, без ответа ELT) не сохраняются,
+        в ответе с отказом СК отсутствующие суммы заменяются на 0 (колонки NOT NULL).
+    """
+    insurance_elts = []
+    for company_data in data:
+        for company_name, company_info in company_data.items():
+            if company_info.get('status') != global_schemas.StatusResponseEnum.SUCCESS:
+                continue
+            insurance_data = company_info['data']
+            payment_periods = insurance_data.get('PaymentPeriods')
+            insurance_elts.append({
+                'calc_id': int(calc_id),
+                'insurance_id': insurance_id,
+                'insurance_name': company_name,
+                'RequestId': insurance_data.get('RequestId') or '',
+                'SKCalcId': insurance_data.get('SKCalcId'),
+                'Message': insurance_data.get('Message'),
+                'Error': insurance_data.get('Error'),
+                'PremiumSum': insurance_data.get('PremiumSum') or 0,
+                'KASKOSum': insurance_data.get('KASKOSum') or 0,
+                'DOSum': insurance_data.get('DOSum') or 0,
+                'GOSum': insurance_data.get('GOSum') or 0,
+                'NSSum': insurance_data.get('NSSum') or 0,
+                'GAPSum': insurance_data.get('GAPSum') or 0,
+                'TotalFranchise': insurance_data.get('TotalFranchise'),
+                'payments_period': payment_periods.get('PaymentPeriod') if payment_periods else None,
+            })
+    return insurance_elts
+
+
 async def create_insurance_elt(calc_id: int, calc_reso_id: int, rl_actions_data: dict, data: list, session: AsyncSession):
     """
-        Create Insurance Elt
+        Create or Replace Insurance Elt: Страхование и котировки СК в одной транзакции
+
+        Страхование с тем же calc_reso_id обновляется, его котировки заменяются.
+        Блокировка строки при upsert упорядочивает одновременные пересчеты.
     """
     try:
-        # Создание Страхования
-        new_insurance = Insurance(
+        # Создание или обновление Страхования
+        query = insert(Insurance).values(
             calc_id=int(calc_id),
             calc_reso_id=calc_reso_id,
             quote_id=rl_actions_data.get('quote_id'),
             police_id=rl_actions_data.get('police_id'),
         )
-        session.add(new_insurance)
-        await session.commit()
+        query = (
+            query
+            .on_conflict_do_update(
+                index_elements=[Insurance.calc_reso_id],
+                set_={
+                    'calc_id': query.excluded.calc_id,
+                    'quote_id': query.excluded.quote_id,
+                    'police_id': query.excluded.police_id,
+                    'created_at': func.now(),
+                },
+            )
+            .returning(Insurance.id)
+        )
+        insurance_id = (await session.execute(query)).scalar_one()
+
+        # Котировки предыдущего расчета
+        await session.execute(delete(InsuranceElt).where(InsuranceElt.insurance_id == insurance_id))
 
-        # Добавление ELT Котировок
-        for company_data in data:
-            for company_name, company_info in company_data.items():
-                insurance_data = company_info['data']
-                payment_periods = insurance_data.get('PaymentPeriods')
-                insurance_elt = InsuranceElt(
-                    calc_id=int(calc_id),
-                    insurance_id=new_insurance.id,
-                    insurance_name=company_name,
-                    RequestId=insurance_data.get('RequestId'),
-                    SKCalcId=insurance_data.get('SKCalcId'),
-                    Message=insurance_data.get('Message'),
-                    Error=insurance_data.get('Error'),
-                    PremiumSum=insurance_data.get('PremiumSum'),
-                    KASKOSum=insurance_data.get('KASKOSum'),
-                    DOSum=insurance_data.get('DOSum'),
-                    GOSum=insurance_data.get('GOSum'),
-                    NSSum=insurance_data.get('NSSum'),
-                    GAPSum=insurance_data.get('GAPSum'),
-                    TotalFranchise=insurance_data.get('TotalFranchise'),
-                    payments_period=payment_periods.get('PaymentPeriod') if payment_periods else None,
-                )
-                session.add(insurance_elt)
+        # Добавление ELT Котировок одним запросом
+        insurance_elts = build_insurance_elts(calc_id, insurance_id, data)
+        if insurance_elts:
+            await session.execute(insert(InsuranceElt).values(insurance_elts))
 
         # Подтвердите изменения в базе данных
         await session.commit()
     except Exception as exc:
+        await session.rollback()
         logger.error(exc)
+        raise
 
 
 async def update_insurance(calc_id: int, values: dict, session: AsyncSession):
@@ -86,21 +116,36 @@ async def update_insurance(calc_id: int, values: dict, session: AsyncSession):
     await session.commit()
 
 
-async def delete_insurance_by_calc_reso_id(calc_reso_id: int, session: AsyncSession):
-    try:
-        # Получаем объект Insurance по calc_reso_id
-        result = await session.execute(
-            select(Insurance).filter(Insurance.calc_reso_id == calc_reso_id)
+async def get_elt_dictionary(method: str, params: str, session: AsyncSession):
+    """
+        Get ELT Dictionary with its age in seconds
+    """
+    query = (
+        select(
+            EltDictionary.data,
+            EltDictionary.fetched_at,
+            func.extract('epoch', func.now() - EltDictionary.fetched_at).label('age'),
         )
+        .where(
+            EltDictionary.method == method,
+            EltDictionary.params == params,
+        )
+    )
+    result = await session.execute(query)
+    return result.one_or_none()
 
-        insurance = result.scalars().one()  # Получаем единственный объект Insurance
-
-        # Удаляем объект Insurance
-        await session.delete(insurance)
 
-        # Сохраняем изменения в базе данных
-        await session.commit()
-    except Exception as e:
-        # В случае ошибки откатываем транзакцию
-        await session.rollback()
-        print(f"An error occurred: {e}")
+async def save_elt_dictionary(method: str, params: str, data, session: AsyncSession):
+    """
+        Create or Update ELT Dictionary
+    """
+    query = (
+        insert(EltDictionary)
+        .values(method=method, params=params, data=data)
+        .on_conflict_do_update(
+            index_elements=[EltDictionary.method, EltDictionary.params],
+            set_={'data': data, 'fetched_at': func.now()},
+        )
+    )
+    await session.execute(query)
+    await session.commit()
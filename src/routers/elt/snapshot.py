@@ -0,0 +1,154 @@
+import os
+import sys
+import json
+import hashlib
+import tempfile
+from datetime import datetime, timezone
+
+from zeep.cache import Base
+from zeep.wsdl import Document
+from zeep.transports import Transport
+
+from src.logger import logger
+from src.config import settings
+
+
+class WsdlSnapshot(Base):
+    """
+        Снимок WSDL/XSD на диске
+
+        Хранит документы, загруженные при разборе WSDL, в каталоге по ключу URL.
+        Содержимое документов адресуется хэшем, каждая версия описывается манифестом,
+        файл `current` указывает на активную версию.
+    """
+
+    def __init__(self, url: str, directory: str = None, refresh: bool = False):
+        """
+            Инициализация
+        """
+        self.url = url
+        self.directory = os.path.join(
+            directory or settings.WSDL_SNAPSHOT_DIR,
+            hashlib.sha256(url.encode()).hexdigest()[:16],
+        )
+        self.refresh = refresh
+        self.version = None
+        self._documents = {}
+        self._fetched = {}
+        if not refresh:
+            self._read_manifest()
+
+    def _object_path(self, content_hash: str) -> str:
+        return os.path.join(self.directory, 'objects', content_hash)
+
+    def _read_manifest(self):
+        """
+            Чтение активной версии снимка
+        """
+        try:
+            with open(os.path.join(self.directory, 'current'), encoding='utf-8') as file:
+                version = file.read().strip()
+            with open(os.path.join(self.directory, f'{version}.json'), encoding='utf-8') as file:
+                manifest = json.load(file)
+        except (OSError, ValueError):
+            return
+        self.version = manifest['version']
+        self._documents = manifest['documents']
+
+    @staticmethod
+    def _write_atomic(path: str, content: bytes):
+        """
+            Атомарная запись файла (безопасно для нескольких воркеров)
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(content)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def get(self, url):
+        """
+            Получение документа из снимка
+        """
+        if url in self._fetched:
+            return self._fetched[url]
+        content_hash = self._documents.get(url)
+        if content_hash is None:
+            return None
+        try:
+            with open(self._object_path(content_hash), 'rb') as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def add(self, url, content):
+        """
+            Запоминание документа, загруженного с удаленного хоста
+        """
+        self._fetched[url] = content
+
+    def save(self) -> str | None:
+        """
+            Сохранение новой версии снимка, если были загружены новые документы
+        """
+        if not self._fetched:
+            return self.version
+
+        documents = {} if self.refresh else dict(self._documents)
+        for url, content in self._fetched.items():
+            content_hash = hashlib.sha256(content).hexdigest()
+            if not os.path.exists(self._object_path(content_hash)):
+                self._write_atomic(self._object_path(content_hash), content)
+            documents[url] = content_hash
+
+        version = hashlib.sha256(
+            json.dumps(documents, sort_keys=True).encode()
+        ).hexdigest()[:12]
+        manifest = {
+            'url': self.url,
+            'version': version,
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'documents': documents,
+        }
+        self._write_atomic(
+            os.path.join(self.directory, f'{version}.json'),
+            json.dumps(manifest, ensure_ascii=False, indent=2).encode(),
+        )
+        self._write_atomic(os.path.join(self.directory, 'current'), version.encode())
+
+        self.version = version
+        self._documents = documents
+        self._fetched = {}
+        logger.info(f'WSDL snapshot {self.url} is saved (version={version})')
+        return version
+
+
+def load_document(url: str, transport: Transport, refresh: bool = False) -> Document:
+    """
+        Разбор WSDL из снимка на диске, недостающие документы загружаются и сохраняются
+    """
+    snapshot = WsdlSnapshot(url, refresh=refresh)
+    transport.cache = snapshot
+    document = Document(url, transport)
+    snapshot.save()
+    return document
+
+
+def refresh(urls: list[str]):
+    """
+        Принудительное обновление снимков
+    """
+    for url in urls:
+        load_document(url, Transport(), refresh=True)
+
+
+if __name__ == '__main__':
+    # python -m src.routers.elt.snapshot refresh [url ...]
+    if len(sys.argv) < 2 or sys.argv[1] != 'refresh':
+        print('Usage: python -m src.routers.elt.snapshot refresh [url ...]')
+        sys.exit(1)
+    refresh(sys.argv[2:] or [settings.ELT_URL, settings.RESO_GUARANTEE])
@@ -1,30 +1,51 @@
 import json
 import time
+import hashlib
 import httpx
 import asyncio
-from requests import Session
+from collections import deque
 from fastapi import status
+from fastapi.encoders import jsonable_encoder
 from zeep.exceptions import Fault
-from zeep import Client, AsyncClient
+from zeep import AsyncClient
 from zeep.helpers import serialize_object
 from zeep.wsse.username import UsernameToken
 from sqlalchemy.ext.asyncio import AsyncSession
-from zeep.transports import Transport, AsyncTransport
+from zeep.transports import AsyncTransport
 
 from src.logger import logger
 from src.config import settings
+from src.database import get_async_generator_session
 from src.routers.elt import schemas, services
+from src.routers.elt.cache import TTLCache
+from src.routers.elt.kladr import KladrIndex
+from src.routers.elt.snapshot import load_document
 from src.schemas import schemas as global_schemas
 from src.exceptions import exceptions as global_exceptions
 
 
+async def _build_async_client(wsdl: str, transport: AsyncTransport, wsse=None) -> AsyncClient:
+    """
+        Асинхронный клиент zeep: WSDL разбирается (из снимка) в потоке, не блокируя event loop
+    """
+    document = await asyncio.to_thread(load_document, wsdl, transport)
+    return AsyncClient(document, transport=transport, wsse=wsse)
+
+
 class EltService:
     """
         ELT Сервис
+
+        Клиент расчетов создается один раз при старте приложения и закрывается
+        при остановке, запросы всех расчетов идут через него.
     """
     _cache = {}
     _client = None
-    _client_reso_guarantee = None
+    _http_client = None
+    _lock = asyncio.Lock()
+    _latencies = {}
+    # Расчеты СК: (метод, хэш входных данных, СК) -> результат
+    _results = TTLCache(maxsize=settings.ELT_CALCULATION_CACHE_MAXSIZE)
     available_companies = [
         'ВСК',
         'Согласие',
@@ -50,51 +71,10 @@ class EltService:
         """
             Закрытие клиента и сессии
         """
-        if cls._client:
-            cls._client = None  # Очищаем клиент
-
-    @classmethod
-    def request_reso_guarantee(cls, client_, cache_id: str, method: str, params=None):
-        """
-            Запрос
-        """
-        if method is None:
-            return None
-
-        # Выполнение запроса
-        try:
-            if params:
-                data = getattr(client_.service, method)(**params)
-            else:
-                data = getattr(client_.service, method)()
-        except Fault as e:
-            print(f"SOAP Fault: {e}")
-            return None
-        return data
-
-    def get_client_reso_guarantee(self):
-        """
-            Получение клиента SOAP
-        """
-
-        if EltService._client_reso_guarantee is None:
-            EltService._session_reso_guarantee = Session()
-            EltService._session_reso_guarantee.headers.update({'Content-Type': 'application/json; charset=utf-8'})
-            transport = Transport(session=EltService._session_reso_guarantee)
-            EltService._client_reso_guarantee = Client(
-                settings.RESO_GUARANTEE,
-                transport=transport,
-                wsse=UsernameToken(self.username, self.password),
-            )
-        return EltService._client_reso_guarantee
-
-    @classmethod
-    def close_reso_guarantee(cls):
-        """
-            Закрытие клиента и сессии
-        """
-        if cls._client_reso_guarantee:
-            cls._client_reso_guarantee = None  # Очищаем клиент
+        if cls._http_client:
+            await cls._http_client.aclose()
+            cls._http_client = None
+        cls._client = None
 
     @classmethod
     async def request(cls, client_, cache_id: str, method: str, params=None):
@@ -120,13 +100,21 @@ class EltService:
             Получение клиента SOAP
         """
         if EltService._client is None:
-            async_client = httpx.AsyncClient(
-                auth=(self.username, self.password),
-                verify=True,
-                timeout=240,
-            )
-            transport = AsyncTransport(client=async_client)
-            EltService._client = AsyncClient(settings.ELT_URL, transport=transport)
+            async with EltService._lock:
+                if EltService._client is None:
+                    # Ограничение времени задается бюджетом метода/СК в calculate_company
+                    http_client = httpx.AsyncClient(
+                        auth=(self.username, self.password),
+                        verify=True,
+                        timeout=max(
+                            settings.ELT_TIMEOUT,
+                            *settings.ELT_METHOD_TIMEOUTS.values(),
+                            *settings.ELT_COMPANY_TIMEOUTS.values(),
+                        ),
+                    )
+                    client = await _build_async_client(settings.ELT_URL, AsyncTransport(client=http_client))
+                    EltService._http_client = http_client
+                    EltService._client = client
         return EltService._client
 
     @classmethod
@@ -154,17 +142,11 @@ class EltService:
         """
             Получения идентификатора, КЛАДРа с полным наименованием регионов
         """
-        cache_id = 'get_kladr_full_regions'
-        data = await cls.request(client_, cache_id,'GetRegionsExt')
-
-        # Функция для фильтрации
-        def filter_by_name(item):
-            return name in item['Name']
-
-        # Используем filter для получения отфильтрованных данных
-        filtered_data = serialize_object(list(filter(filter_by_name, data)))
-        if filtered_data:
-            return filtered_data[0].get('Kladr')
+        soap = SoapServiceAsync(settings.ELT_USERNAME, settings.ELT_PASSWORD.get_secret_value())
+        index = await soap.get_kladr_index()
+        region = index.find_region(name)
+        if region:
+            return region.get('Kladr')
 
     @staticmethod
     async def check_valid_more_three_companies(data: list[dict]):
@@ -194,11 +176,7 @@ class EltService:
             Сохранение в Базу Данных
         """
         try:
-            # Проверка есть ли в базе
-            exist_insurance = await services.check_exist_insurance(calc_reso_id, session)
-            print('exist_insurance: ', exist_insurance)
-            if exist_insurance:
-                await services.delete_insurance_by_calc_reso_id(calc_reso_id, session)
+            # Замена прежнего расчета с тем же calc_reso_id одной транзакцией
             await services.create_insurance_elt(calc_id, calc_reso_id, rl_actions_data, data, session)
         except Exception as exc:
             logger.error(exc)
@@ -208,80 +186,113 @@ class EltService:
                 message='Произошла ошибка при сохранении результата ELT в Базу Данных',
             )
 
-    async def get_rl_actions(self,
-                             data: schemas.ResoGuaranteeCreate,
-                             companies: list[dict], session: AsyncSession):
+    @staticmethod
+    async def get_rl_actions(data: schemas.ResoGuaranteeCreate,
+                             companies: list[dict], session: AsyncSession) -> dict:
         """
             Передача номер расчета ЕЛТ и премии конкурентов в Ресо Гарантию
         """
-        params = {
-            'parameter': {
-                'CalcID': data.calc_id,
-                'PrevCalcID': data.prev_calc_id,
-                'CalculationList': {
-                    'Calculation': companies,
-                }
-            }
-        }
-        response_rl_actions = self.request_reso_guarantee(
-            self._client_reso_guarantee,
-            'get_rl_actions',
-            'GetRLActions',
-            params=params,
+        guarantee_soap = ResoGuaranteeAsync(
+            settings.RESO_GUARANTEE_USERNAME,
+            settings.RESO_GUARANTEE_PASSWORD.get_secret_value(),
         )
-        data_rl_actions = serialize_object(response_rl_actions)
-        if data_rl_actions.get('Error') == 'OK':
-            quote_id = data_rl_actions.get('QuoteID')
-            police_id = data_rl_actions.get('PolicyID')
+        return await guarantee_soap.get_rl_actions(data, companies, session)
 
-            response_status = self.request_reso_guarantee(
-                self._client_reso_guarantee,
-                'get_rl_status',
-                'GetRLStatus',
-                params={'QuoteID': quote_id},
-            )
-            data_status = serialize_object(response_status)
-            # Добавляем в Базу Квот
-            await services.update_insurance(
-                data.calc_id,
-                {'quote_id': quote_id, 'police_id': police_id},
-                session,
-            )
-            if data_status.get('Error') == 'OK':
-                if data_status.get('Status') == 'SUCEESS':
-                    return {'quote_id': quote_id, 'police_id': police_id}
-                else:
-                    raise global_exceptions.MyHTTPException(
-                        status=global_schemas.StatusResponseEnum.ERROR,
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        message=data_status,
-                    )
-            else:
-                raise global_exceptions.MyHTTPException(
-                    status=global_schemas.StatusResponseEnum.ERROR,
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    message=data_status.get('Error'),
-                )
-        else:
-            raise global_exceptions.MyHTTPException(
-                status=global_schemas.StatusResponseEnum.ERROR,
-                status_code=status.HTTP_400_BAD_REQUEST,
-                message=data_rl_actions,
-            )
+    @staticmethod
+    def get_timeout(method: str, company: str) -> float:
+        """
+            Бюджет времени запроса: СК > метод > общий
+        """
+        if company in settings.ELT_COMPANY_TIMEOUTS:
+            return settings.ELT_COMPANY_TIMEOUTS[company]
+        return settings.ELT_METHOD_TIMEOUTS.get(method, settings.ELT_TIMEOUT)
 
-    async def casco_calculation(self,
-                                method: str,
-                                cache_id: str,
-                                data: schemas.EltCascoCalculation,
-                                session: AsyncSession):
+    @classmethod
+    def record_latency(cls, method: str, company: str, latency: float):
         """
-            Метод получения расчета
+            Сохранение времени ответа СК
         """
-        calc_id = None
-        result_requests = []
-        calc_reso_id = data.calc_reso_id
+        key = (method, company)
+        if key not in cls._latencies:
+            cls._latencies[key] = deque(maxlen=settings.ELT_HEDGE_WINDOW)
+        cls._latencies[key].append(latency)
+
+    @classmethod
+    def get_hedge_delay(cls, method: str, company: str) -> float | None:
+        """
+            Задержка перед дублирующим запросом (перцентиль времени ответа СК)
+        """
+        if not settings.ELT_HEDGE_ENABLED:
+            return None
+        latencies = cls._latencies.get((method, company))
+        if not latencies or len(latencies) < settings.ELT_HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(latencies)
+        return ordered[min(int(len(ordered) * settings.ELT_HEDGE_PERCENTILE), len(ordered) - 1)]
+
+    async def hedged_request(self, client_, cache_id: str, method: str, company: str, request: dict) -> tuple:
+        """
+            Запрос с дублированием: если СК отвечает дольше перцентиля,
+            отправляется повторный запрос и берется первый ответ
+        """
+        started = time.monotonic()
+        tasks = {asyncio.create_task(self.request(client_, cache_id, method, request))}
+        hedged = False
+        try:
+            delay = self.get_hedge_delay(method, company)
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done:
+                    hedged = True
+                    tasks.add(asyncio.create_task(self.request(client_, cache_id, method, request)))
+
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        self.record_latency(method, company, time.monotonic() - started)
+                        return task.result(), hedged
+            # Все запросы завершились ошибкой
+            raise done.pop().exception()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    @staticmethod
+    def calculation_key(params: dict) -> str:
+        """
+            Хэш входных данных расчета (не зависит от порядка ключей)
+        """
+        return hashlib.sha256(
+            json.dumps(params, sort_keys=True, default=str, ensure_ascii=False).encode()
+        ).hexdigest()
 
-        for company in data.active_companies:
+    async def calculate_company(self,
+                                client_,
+                                method: str,
+                                cache_id: str,
+                                company: str,
+                                params: dict,
+                                semaphore: asyncio.Semaphore,
+                                refresh: bool = False) -> dict:
+        """
+            Метод получения расчета по одной СК
+
+            Успешный расчет кэшируется на ELT_CALCULATION_CACHE_TTL, из кэша
+            результат возвращается с признаком cached.
+        """
+        key = None
+        if company not in settings.ELT_CALCULATION_CACHE_EXCLUDE:
+            key = (method, self.calculation_key(params), company)
+            if not refresh:
+                found, cached = self._results.get(key)
+                if found:
+                    return {company: {**cached, 'cached': True}}
+
+        async with semaphore:
+            outcome = schemas.CalculationOutcomeEnum.ERROR
+            message = 'Не правильный запрос'
+            timeout = self.get_timeout(method, company)
             try:
                 request = {
                     'AuthInfo': {
@@ -290,45 +301,66 @@ class EltService:
                     },
                     'InsuranceCompany': company,
                     'ContractOptionId': 1,
-                    'Params': data.model_dump(exclude={'calc_reso_id', 'active_companies'}),
+                    'Params': params,
                 }
-                result = await self.request(self._client, cache_id, method, request)
+                result, hedged = await asyncio.wait_for(
+                    self.hedged_request(client_, cache_id, method, company, request),
+                    timeout=timeout,
+                )
                 # Преобразование результата в словарь
                 result_dict = serialize_object(result)
-                if not result_dict:
-                    result_requests.append(
-                        {
-                            company: {
-                                'status': global_schemas.StatusResponseEnum.ERROR,
-                                'data': {
-                                    'message': 'Не правильный запрос',
-                                }
-                            },
-                        }
-                    )
-                result_requests.append(
-                    {
-                        company: {
-                            'status': global_schemas.StatusResponseEnum.SUCCESS,
-                            'data': result_dict,
-                        },
+                if result_dict:
+                    company_result = {
+                        'status': global_schemas.StatusResponseEnum.SUCCESS,
+                        'outcome': (
+                            schemas.CalculationOutcomeEnum.HEDGED if hedged
+                            else schemas.CalculationOutcomeEnum.COMPLETED
+                        ),
+                        'data': result_dict,
                     }
-                )
-                if company == 'RESO_GARANTIJA':
-                    calc_id = result_dict.get('SKCalcId')
+                    # Отказ СК может быть временным, кэшируются только расчеты без ошибки
+                    if key is not None and result_dict.get('Error') is None:
+                        self._results.set(key, company_result, settings.ELT_CALCULATION_CACHE_TTL)
+                    return {company: {**company_result, 'cached': False}}
+            except asyncio.TimeoutError:
+                logger.error(f'{company}: превышено время ожидания расчета ({timeout} с)')
+                outcome = schemas.CalculationOutcomeEnum.TIMEOUT
+                message = 'Превышено время ожидания ответа СК'
             except Exception as e:
                 logger.error(str(e))
-                result_requests.append(
-                    {
-                        company: {
-                            'status': global_schemas.StatusResponseEnum.ERROR,
-                            'data': {
-                                'message': 'Не правильный запрос',
-                            }
-                        },
+            return {
+                company: {
+                    'status': global_schemas.StatusResponseEnum.ERROR,
+                    'outcome': outcome,
+                    'cached': False,
+                    'data': {
+                        'message': message,
                     }
-                )
+                },
+            }
+
+    @staticmethod
+    def cancel_tasks(tasks: list[asyncio.Task]):
+        """
+            Отмена незавершенных расчетов СК
+        """
+        for task in tasks:
+            task.cancel()
+
+    @staticmethod
+    def get_reso_calc_id(companies: list[str], result_requests: list[dict]):
+        """
+            Получение номера расчета Ресо Гарантии
+        """
+        if 'RESO_GARANTIJA' not in companies:
+            return None
+        reso_guarantee = result_requests[companies.index('RESO_GARANTIJA')]['RESO_GARANTIJA']
+        return reso_guarantee['data'].get('SKCalcId')
 
+    async def send_rl_actions(self, result_requests: list[dict], session: AsyncSession) -> dict:
+        """
+            Проверка расчетов и отправка котировок в Ресо Гарантию
+        """
         # Проверка на валидность
         await self.check_valid_more_three_companies(result_requests)
 
@@ -347,19 +379,111 @@ class EltService:
         rl_actions_data = await self.get_rl_actions(data_rl_actions, companies, session)
         result_requests[3].get('RESO_GARANTIJA')['quote_id'] = rl_actions_data.get('quote_id')
         result_requests[3].get('RESO_GARANTIJA')['police_id'] = rl_actions_data.get('police_id')
+        return rl_actions_data
+
+    async def casco_calculation(self,
+                                method: str,
+                                cache_id: str,
+                                data: schemas.EltCascoCalculation,
+                                session: AsyncSession):
+        """
+            Метод получения расчета
+        """
+        calc_reso_id = data.calc_reso_id
+        params = data.model_dump(exclude={'calc_reso_id', 'active_companies', 'force_refresh'})
+
+        # Параллельные запросы в СК, порядок результатов совпадает с active_companies
+        client = await self.get_client()
+        semaphore = asyncio.Semaphore(settings.ELT_CALCULATION_CONCURRENCY)
+        tasks = [
+            asyncio.create_task(
+                self.calculate_company(client, method, cache_id, company, params, semaphore, data.force_refresh)
+            )
+            for company in data.active_companies
+        ]
+        try:
+            result_requests = list(await asyncio.gather(*tasks))
+        finally:
+            self.cancel_tasks(tasks)
+        calc_id = self.get_reso_calc_id(data.active_companies, result_requests)
+
+        rl_actions_data = await self.send_rl_actions(result_requests, session)
 
         # Сохранение в БД
         calc_id = await self.save_to_database(calc_id, calc_reso_id, rl_actions_data, result_requests, session)
         return result_requests, calc_id
 
+    async def casco_calculation_stream(self,
+                                       method: str,
+                                       cache_id: str,
+                                       data: schemas.EltCascoCalculation,
+                                       session: AsyncSession):
+        """
+            Метод получения расчета с выдачей результата каждой СК по мере ответа
+        """
+        calc_reso_id = data.calc_reso_id
+        params = data.model_dump(exclude={'calc_reso_id', 'active_companies', 'force_refresh'})
+        client = await self.get_client()
+        semaphore = asyncio.Semaphore(settings.ELT_CALCULATION_CONCURRENCY)
+
+        async def calculate(index: int, company: str):
+            return index, await self.calculate_company(client, method, cache_id, company, params, semaphore,
+                                                       data.force_refresh)
+
+        result_requests = [None] * len(data.active_companies)
+        tasks = [asyncio.create_task(calculate(index, company)) for index, company in enumerate(data.active_companies)]
+        try:
+            for future in asyncio.as_completed(tasks):
+                index, result = await future
+                result_requests[index] = result
+                company = data.active_companies[index]
+                yield {'event': 'company', 'company': company, **result[company]}
+        finally:
+            # Клиент отключился или поток закрыт до конца: оставшиеся СК не занимают семафор и ELT
+            self.cancel_tasks(tasks)
+
+        calc_id = self.get_reso_calc_id(data.active_companies, result_requests)
+        try:
+            rl_actions_data = await self.send_rl_actions(result_requests, session)
+        except global_exceptions.MyHTTPException as exc:
+            yield {
+                'event': 'result',
+                'status': global_schemas.StatusResponseEnum.ERROR,
+                'message': exc.message,
+                'saved': False,
+            }
+            return
+        except Exception as exc:
+            # SOAP Fault Ресо Гарантии или нет расчета RESO_GARANTIJA: поток должен завершиться событием result
+            logger.error(f'Reso-Guarantee rl actions: {exc!r}')
+            yield {
+                'event': 'result',
+                'status': global_schemas.StatusResponseEnum.ERROR,
+                'message': 'Произошла ошибка при отправке котировок в Ресо-Гарантия',
+                'saved': False,
+            }
+            return
+
+        # Сохранение в БД
+        try:
+            await self.save_to_database(calc_id, calc_reso_id, rl_actions_data, result_requests, session)
+            saved = True
+        except global_exceptions.MyHTTPException:
+            saved = False
+        yield {
+            'event': 'result',
+            'status': global_schemas.StatusResponseEnum.SUCCESS,
+            'quote_id': rl_actions_data.get('quote_id'),
+            'police_id': rl_actions_data.get('police_id'),
+            'saved': saved,
+        }
+
 
 class SoapService:
     """
         ELT Сервис
     """
-    _cache = {}
-    _client = None
-    _session = None
+    _cache = TTLCache(maxsize=settings.ELT_CACHE_MAXSIZE)
     available_companies = [
         'ВСК',
         'Согласие',
@@ -393,39 +517,25 @@ class SoapService:
         return companies_ids
 
     @staticmethod
-    def get_client(username: str, password: str):
+    def cache_key(method: str, params=None) -> tuple:
         """
-            Получение клиента SOAP
+            Ключ кэша по методу и параметрам запроса
         """
-        if SoapService._client is None:
-            SoapService._session = Session()
-            transport = Transport(session=SoapService._session)
-            SoapService._client = Client(settings.ELT_URL, transport=transport, wsse=UsernameToken(username, password))
-        return SoapService._client
+        return method, json.dumps(params, sort_keys=True, default=str)
 
     @classmethod
-    def close(cls):
-        """
-        Закрытие клиента и сессии
-        """
-        if cls._client:
-            cls._client = None  # Очищаем клиент
-        if cls._session:
-            cls._session.close()  # Закрываем сессию
-            cls._session = None
-
-    @classmethod
-    def request(cls, client_, cache_id: str, method: str, params=None, is_cache: bool = False, cache_time: int = 1000):
-        current_time = time.time()
-
-        if is_cache:
-            # Проверка кэша
-            if cache_id in cls._cache and (current_time - cls._cache[cache_id]['timestamp'] < cache_time):
-                return cls._cache[cache_id]['data']
-
+    def request(cls, client_, cache_id: str, method: str, params=None):
         if method is None:
             return None
 
+        # Проверка кэша, время жизни задается по методу
+        ttl = settings.ELT_CACHE_TTL.get(method)
+        key = cls.cache_key(method, params)
+        if ttl:
+            found, data = cls._cache.get(key)
+            if found:
+                return data
+
         # Выполнение запроса
         try:
             if params:
@@ -436,9 +546,9 @@ class SoapService:
             print(f"SOAP Fault: {e}")
             return None
 
-        if is_cache:
+        if ttl and data is not None:
             # Сохранение в кэш
-            cls._cache[cache_id] = {'data': data, 'timestamp': current_time}
+            cls._cache.set(key, data, ttl)
         return data
 
     @classmethod
@@ -598,7 +708,7 @@ class SoapService:
             Получения идентификатора, КЛАДРа с полным наименованием регионов
         """
         cache_id = 'get_kladr_full_regions'
-        return cls.request(client_, cache_id,'GetRegionsExt', is_cache=True, cache_time=86400)
+        return cls.request(client_, cache_id, 'GetRegionsExt')
 
     @classmethod
     def get_full_kladr_cities(cls, client_, region_id: str):
@@ -611,8 +721,6 @@ class SoapService:
             cache_id,
             'GetCitiesExt',
             params={'RegionId': region_id},
-            is_cache=True,
-            cache_time=86400,
         )
 
     @classmethod
@@ -684,7 +792,7 @@ class SoapService:
         """
             Получение Типа коробки передач
         """
-        options = client_.service.GetOptions()
+        options = cls.get_ref_info(client_)
         filtered_type = next((item for item in options if item['Id'] == key), None)
         if filtered_type:
             option_values = filtered_type['Values']['OptionValue']
@@ -817,12 +925,233 @@ class SoapService:
         return result_requests, calc_id
 
 
-class ResoGuarantee:
+class SoapServiceAsync(SoapService):
+    """
+        Асинхронный ELT Сервис справочников
+
+        Запросы выполняются через zeep.AsyncClient поверх одного долгоживущего
+        httpx.AsyncClient, методы-справочники наследуются от SoapService
+        и возвращают awaitable.
+    """
+    _client = None
+    _http_client = None
+    _lock = asyncio.Lock()
+    _kladr_index = None
+    _kladr_lock = asyncio.Lock()
+    _options_index = None
+
+    async def get_client(self):
+        """
+            Получение клиента SOAP
+        """
+        if SoapServiceAsync._client is None:
+            async with SoapServiceAsync._lock:
+                if SoapServiceAsync._client is None:
+                    http_client = httpx.AsyncClient(
+                        verify=True,
+                        timeout=240,
+                        limits=httpx.Limits(
+                            max_connections=settings.ELT_MAX_CONNECTIONS,
+                            max_keepalive_connections=settings.ELT_MAX_CONNECTIONS,
+                        ),
+                    )
+                    client = await _build_async_client(
+                        settings.ELT_URL,
+                        AsyncTransport(client=http_client),
+                        wsse=UsernameToken(self.username, self.password),
+                    )
+                    SoapServiceAsync._http_client = http_client
+                    SoapServiceAsync._client = client
+        return SoapServiceAsync._client
+
+    @classmethod
+    async def close(cls):
+        """
+            Закрытие клиента и сессии
+        """
+        if cls._http_client:
+            await cls._http_client.aclose()
+            cls._http_client = None
+        cls._client = None
+
+    @classmethod
+    async def call(cls, client_, method: str, params=None):
+        """
+            Выполнение запроса
+        """
+        try:
+            if params:
+                return await getattr(client_.service, method)(**params)
+            return await getattr(client_.service, method)()
+        except Fault as e:
+            logger.error(f'ELT SOAP Fault {method}: {e}')
+            return None
+
+    @classmethod
+    async def fetch(cls, client_, method: str, params=None):
+        """
+            Запрос в ELT с сохранением справочника в Базу Данных
+        """
+        data = await cls.call(client_, method, params)
+        if data is None or method not in settings.ELT_PERSIST_METHODS:
+            return data
+
+        data = jsonable_encoder(serialize_object(data))
+        try:
+            async with get_async_generator_session() as session:
+                await services.save_elt_dictionary(method, cls.cache_key(method, params)[1], data, session)
+        except Exception as exc:
+            logger.error(f'ELT dictionary {method} is not saved: {exc}')
+        return data
+
+    @classmethod
+    async def load(cls, client_, method: str, params, ttl: float) -> tuple:
+        """
+            Загрузка справочника: свежая запись БД -> ELT -> устаревшая запись БД
+
+            Возвращает (данные, время жизни в кэше): запись БД живет в кэше
+            только оставшуюся часть ttl, устаревшая — не дольше ELT_STALE_TTL,
+            после чего запрос в ELT повторяется.
+        """
+        if method not in settings.ELT_PERSIST_METHODS:
+            return await cls.call(client_, method, params), ttl
+
+        stored = None
+        try:
+            async with get_async_generator_session() as session:
+                stored = await services.get_elt_dictionary(method, cls.cache_key(method, params)[1], session)
+        except Exception as exc:
+            logger.error(f'ELT dictionary {method} is not read: {exc}')
+        if stored is not None and stored.age < ttl:
+            return stored.data, ttl - float(stored.age)
+
+        try:
+            data = await cls.fetch(client_, method, params)
+        except Exception as exc:
+            logger.error(f'ELT {method}: {exc}')
+            data = None
+        if data is None and stored is not None:
+            logger.warning(f'ELT {method} is unavailable, stored dictionary from {stored.fetched_at} is used')
+            return stored.data, min(ttl, settings.ELT_STALE_TTL)
+        return data, ttl
+
+    @classmethod
+    async def request(cls, client_, cache_id: str, method: str, params=None):
+        if method is None:
+            return None
+
+        # Кэш с временем жизни по методу, одновременные промахи объединяются в один запрос
+        ttl = settings.ELT_CACHE_TTL.get(method)
+        if not ttl:
+            return await cls.call(client_, method, params)
+        return await cls._cache.get_or_load(
+            cls.cache_key(method, params),
+            lambda: cls.load(client_, method, params, ttl),
+        )
+
+    @classmethod
+    async def warm(cls, client_, method: str, params=None) -> float | None:
+        """
+            Загрузка записи кэша (сначала из Базы Данных), возвращает оставшееся время жизни
+        """
+        await cls.request(client_, method, method, params)
+        remaining = cls._cache.remaining(cls.cache_key(method, params))
+        if remaining is None:
+            raise RuntimeError(f'{method} returned no data')
+        return remaining
+
+    @classmethod
+    async def refresh(cls, client_, method: str, params=None):
+        """
+            Принудительное обновление записи кэша
+        """
+        data = await cls.fetch(client_, method, params)
+        if data is None:
+            raise RuntimeError(f'{method} returned no data')
+        cls._cache.set(cls.cache_key(method, params), data, settings.ELT_CACHE_TTL[method])
+        return data
+
+    @classmethod
+    async def build_kladr_index(cls, client_) -> KladrIndex:
+        """
+            Построение индекса КЛАДР из регионов и городов всех регионов
+        """
+        regions = serialize_object(await cls.get_full_kladr_regions(client_)) or []
+        semaphore = asyncio.Semaphore(settings.ELT_KLADR_CONCURRENCY)
+
+        async def load_cities(region: dict):
+            async with semaphore:
+                cities = await cls.get_full_kladr_cities(client_, region['Id'])
+                return region['Id'], serialize_object(cities) or []
+
+        cities = dict(await asyncio.gather(*(load_cities(region) for region in regions)))
+        cls._kladr_index = await asyncio.to_thread(KladrIndex, regions, cities)
+        logger.info(f'KLADR index is built ({len(cls._kladr_index)} items)')
+        return cls._kladr_index
+
+    async def get_kladr_index(self) -> KladrIndex:
+        """
+            Получение индекса КЛАДР, при первом обращении индекс строится
+        """
+        if SoapServiceAsync._kladr_index is None:
+            async with SoapServiceAsync._kladr_lock:
+                if SoapServiceAsync._kladr_index is None:
+                    await self.build_kladr_index(await self.get_client())
+        return SoapServiceAsync._kladr_index
+
+    @classmethod
+    async def get_available_companies(cls, client_, login) -> list[str]:
+        """
+            Get Available Companies
+        """
+        companies = serialize_object(await cls.get_list_sk(client_, login))
+        return [company.get('Id') for company in companies]
+
+    @classmethod
+    async def get_puu_marks(cls, client_, type_=None):
+        cache_id = "insurance_puu_values"
+        puu = await cls.request(client_, cache_id, "GetPUUMarks")
+
+        if type_ == 1 and puu:
+            return {mark.Id: mark.Name for mark in puu}
+        return puu
+
+    @classmethod
+    async def get_options_index(cls, client_) -> dict[str, list]:
+        """
+            Индекс справочной информации GetOptions: Id -> значения
+
+            Перестраивается только при обновлении GetOptions в кэше.
+        """
+        options = await cls.get_ref_info(client_)
+        if options is None:
+            return {}
+        if cls._options_index is None or cls._options_index[0] is not options:
+            cls._options_index = (options, {
+                item['Id']: serialize_object(item['Values']['OptionValue']) if item['Values'] else []
+                for item in options
+            })
+        return cls._options_index[1]
+
+    @classmethod
+    async def get_types(cls, client_, key: str):
+        """
+            Получение Типа коробки передач
+        """
+        options_index = await cls.get_options_index(client_)
+        return options_index.get(key)
+
+
+class ResoGuaranteeAsync:
     """
         Ресо Гарантия
+
+        Один zeep.AsyncClient поверх долгоживущего httpx.AsyncClient
+        переиспользуется всеми запросами до остановки приложения.
     """
     _client = None
-    _session = None
+    _http_client = None
+    _lock = asyncio.Lock()
 
     def __init__(self, username: str, password: str):
         """
@@ -832,7 +1161,7 @@ class ResoGuarantee:
         self.password = password
 
     @classmethod
-    def request(cls, client_, cache_id: str, method: str, params=None):
+    async def request(cls, client_, cache_id: str, method: str, params=None):
         """
             Запрос
         """
@@ -842,46 +1171,47 @@ class ResoGuarantee:
         # Выполнение запроса
         try:
             if params:
-                data = getattr(client_.service, method)(**params)
+                data = await getattr(client_.service, method)(**params)
             else:
-                data = getattr(client_.service, method)()
+                data = await getattr(client_.service, method)()
         except Fault as e:
             print(f"SOAP Fault: {e}")
             return None
         return data
 
-    def get_client(self):
+    async def get_client(self):
         """
             Получение клиента SOAP
         """
-
-        if ResoGuarantee._client is None:
-            ResoGuarantee._session = Session()
-            ResoGuarantee._session.headers.update({'Content-Type': 'application/json; charset=utf-8'})
-            transport = Transport(session=ResoGuarantee._session)
-            ResoGuarantee._client = Client(
-                settings.RESO_GUARANTEE,
-                transport=transport,
-                wsse=UsernameToken(self.username, self.password),
-            )
-        return ResoGuarantee._client
+        if ResoGuaranteeAsync._client is None:
+            async with ResoGuaranteeAsync._lock:
+                if ResoGuaranteeAsync._client is None:
+                    http_client = httpx.AsyncClient(verify=True, timeout=240)
+                    client = await _build_async_client(
+                        settings.RESO_GUARANTEE,
+                        AsyncTransport(client=http_client),
+                        wsse=UsernameToken(self.username, self.password),
+                    )
+                    ResoGuaranteeAsync._http_client = http_client
+                    ResoGuaranteeAsync._client = client
+        return ResoGuaranteeAsync._client
 
     @classmethod
-    def close(cls):
+    async def close(cls):
         """
             Закрытие клиента и сессии
         """
-        if cls._client:
-            cls._client = None  # Очищаем клиент
-        if cls._session:
-            cls._session = None
+        if cls._http_client:
+            await cls._http_client.aclose()
+            cls._http_client = None
+        cls._client = None
 
-    def get_rl_status(self, quote_id: int):
+    async def get_rl_status(self, quote_id: int):
         """
             Получение премии по Квоте
         """
-        response_status = self.request(
-            self._client,
+        response_status = await self.request(
+            await self.get_client(),
             'get_rl_status',
             'GetRLStatus',
             params={'QuoteID': quote_id},
@@ -909,10 +1239,11 @@ class ResoGuarantee:
 
     async def get_rl_actions(self,
                              data: schemas.ResoGuaranteeCreate,
-                             companies: list[dict], session: AsyncSession):
+                             companies: list[dict], session: AsyncSession) -> dict:
         """
             Передача номер расчета ЕЛТ и премии конкурентов в Ресо Гарантию
         """
+        client = await self.get_client()
         params = {
             'parameter': {
                 'CalcID': data.calc_id,
@@ -923,8 +1254,8 @@ class ResoGuarantee:
             }
         }
 
-        response_rl_actions = self.request(
-            self._client,
+        response_rl_actions = await self.request(
+            client,
             'get_rl_actions',
             'GetRLActions',
             params=params,
@@ -935,8 +1266,8 @@ class ResoGuarantee:
             quote_id = data_rl_actions.get('QuoteID')
             police_id = data_rl_actions.get('PolicyID')
 
-            response_status = self.request(
-                self._client,
+            response_status = await self.request(
+                client,
                 'get_rl_status',
                 'GetRLStatus',
                 params={'QuoteID': quote_id},
@@ -951,7 +1282,7 @@ class ResoGuarantee:
 
             if data_status.get('Error') == 'OK':
                 if data_status.get('Status') == 'SUCEESS':
-                    return schemas.QuoteResponse(quote_id=quote_id)
+                    return {'quote_id': quote_id, 'police_id': police_id}
                 else:
                     raise global_exceptions.MyHTTPException(
                         status=global_schemas.StatusResponseEnum.ERROR,
@@ -970,134 +1301,3 @@ class ResoGuarantee:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 message=data_rl_actions,
             )
-
-
-class ResoGuaranteeAsync:
-    """
-        Ресо Гарантия
-    """
-    _client = None
-    _session = None
-
-    def __init__(self, username: str, password: str):
-        """
-            Инициализация
-        """
-        self.username = username
-        self.password = password
-
-    @classmethod
-    async def request(cls, client_, cache_id: str, method: str, params=None):
-        """
-            Запрос
-        """
-        if method is None:
-            return None
-
-        # Выполнение запроса
-        try:
-            if params:
-                data = await getattr(client_.service, method)(**params)
-            else:
-                data = await getattr(client_.service, method)()
-        except Fault as e:
-            print(f"SOAP Fault: {e}")
-            return None
-        return data
-
-    async def get_client(self):
-        """
-            Получение клиента SOAP
-        """
-
-        if ResoGuaranteeAsync._client is None:
-            async_client = httpx.AsyncClient(
-                auth=(self.username, self.password),
-                verify=True,
-                timeout=240,
-            )
-            transport = AsyncTransport(client=async_client)
-            ResoGuaranteeAsync._client = AsyncClient(settings.RESO_GUARANTEE, transport=transport)
-        return ResoGuaranteeAsync._client
-
-    @classmethod
-    async def close(cls):
-        """
-            Закрытие клиента и сессии
-        """
-        if cls._client:
-            cls._client = None  # Очищаем клиент
-        if cls._session:
-            cls._session = None
-
-    async def get_rl_status(self):
-        pass
-
-    async def get_rl_actions(self, calc_id: int):
-        params = {
-            'parameter': {
-                'CalcID': calc_id,
-                'CalculationList': {
-                    'Calculation': [
-                        {
-                            'InsuranceCompany': 'SOGAZ_77',
-                            'PremiumSum': 151074,
-                            'Franchise': 15000,
-                        },
-                        {
-                            'InsuranceCompany': 'Rensins',
-                            'PremiumSum': 126190,
-                            'Franchise': 15000,
-                        },
-                        {
-                            'InsuranceCompany': 'VSK',
-                            'PremiumSum': 143567,
-                            'Franchise': 15000,
-                        },
-                        {
-                            'InsuranceCompany': 'RESO_GARANTIJA',
-                            'PremiumSum': 263101,
-                            'Franchise': 15000,
-                        },
-                    ]
-                }
-            }
-        }
-
-        response_rl_actions = await self.request(
-            self._client,
-            'get_rl_actions',
-            'GetRLActions',
-            params=params,
-        )
-        data_rl_actions = serialize_object(response_rl_actions)
-
-        if data_rl_actions.get('Error') == 'OK':
-            response_status = await self.request(
-                self._client,
-                'get_rl_status',
-                'GetRLStatus',
-                params={'QuoteID': data_rl_actions.get('QuoteID')},
-            )
-            data_status = serialize_object(response_status)
-            if data_status.get('Error') == 'OK':
-                if data_status.get('Status') == 'SUCEESS':
-                    print('SUCCESS')
-                else:
-                    raise global_exceptions.MyHTTPException(
-                        status=global_schemas.StatusResponseEnum.ERROR,
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        message=data_status.get('Error'),
-                    )
-            else:
-                raise global_exceptions.MyHTTPException(
-                    status=global_schemas.StatusResponseEnum.ERROR,
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    message=data_status.get('Error'),
-                )
-        else:
-            raise global_exceptions.MyHTTPException(
-                status=global_schemas.StatusResponseEnum.ERROR,
-                status_code=status.HTTP_400_BAD_REQUEST,
-                message=data_rl_actions,
-            )
@@ -0,0 +1,92 @@
+import random
+import asyncio
+
+from src.logger import logger
+from src.config import settings
+from src.routers.elt.utils import SoapServiceAsync
+
+
+class DictionaryWarmer:
+    """
+        Фоновое обновление справочников ELT
+
+        Загружает справочники и индекс КЛАДР при старте (справочники — из Базы Данных,
+        если там есть свежая запись) и обновляет каждый из ELT незадолго до истечения
+        времени жизни в кэше, при ошибках повторяет с экспоненциальной задержкой.
+    """
+    _tasks = []
+
+    @classmethod
+    def start(cls):
+        """
+            Запуск задач обновления
+        """
+        if cls._tasks:
+            return
+        soap = SoapServiceAsync(settings.ELT_USERNAME, settings.ELT_PASSWORD.get_secret_value())
+
+        def refresh(method: str):
+            loaded = False
+
+            async def job():
+                nonlocal loaded
+                if not loaded:
+                    # Первый проход через кэш и Базу Данных, без запроса в ELT при свежей записи
+                    remaining = await soap.warm(await soap.get_client(), method)
+                    loaded = True
+                    return remaining
+                await soap.refresh(await soap.get_client(), method)
+            return job
+
+        async def build_kladr_index():
+            await soap.build_kladr_index(await soap.get_client())
+
+        jobs = [
+            (method, refresh(method), settings.ELT_CACHE_TTL[method])
+            for method in settings.ELT_WARMER_METHODS
+            if settings.ELT_CACHE_TTL.get(method)
+        ]
+        jobs.append(('kladr_index', build_kladr_index, settings.ELT_CACHE_TTL['GetCitiesExt']))
+
+        cls._tasks = [
+            asyncio.create_task(cls._run(name, job, ttl), name=f'warmer:{name}')
+            for name, job, ttl in jobs
+        ]
+        logger.info(f'ELT dictionary warmer is started ({len(cls._tasks)} jobs)')
+
+    @classmethod
+    async def stop(cls):
+        """
+            Остановка задач обновления
+        """
+        for task in cls._tasks:
+            task.cancel()
+        await asyncio.gather(*cls._tasks, return_exceptions=True)
+        cls._tasks = []
+
+    @staticmethod
+    def _jitter(delay: float) -> float:
+        return delay * (1 + random.uniform(-settings.ELT_WARMER_JITTER, settings.ELT_WARMER_JITTER))
+
+    @classmethod
+    async def _run(cls, name: str, job, ttl: float):
+        """
+            Цикл обновления одного справочника
+        """
+        failures = 0
+        while True:
+            try:
+                # Задание может вернуть оставшееся время жизни записи
+                remaining = await job()
+                failures = 0
+                delay = (ttl if remaining is None else remaining) * settings.ELT_WARMER_REFRESH_RATIO
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                failures += 1
+                delay = min(
+                    settings.ELT_WARMER_BACKOFF_BASE * 2 ** (failures - 1),
+                    settings.ELT_WARMER_BACKOFF_MAX,
+                )
+                logger.error(f'ELT warmer {name}: {exc} (retry in {delay:.0f} s)')
+            await asyncio.sleep(cls._jitter(delay))
@@ -0,0 +1,146 @@
+import csv
+from typing import BinaryIO, Iterator
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import load_workbook
+
+# Колонки таблицы cars, остальные колонки файла игнорируются
+CARS_COLUMNS = ('brand', 'model', 'modif', 'sk_brand', 'sk_model', 'type')
+
+# Сигнатуры форматов: xlsx — zip архив, parquet — PAR1
+XLSX_MAGIC = b'PK\x03\x04'
+PARQUET_MAGIC = b'PAR1'
+CSV_DELIMITERS = ',;\t|'
+# Номер первой строки данных в файле: строки нумеруются с 1, первая — заголовок
+FIRST_DATA_ROW = 2
+
+
+def _cell_value(value):
+    """
+        Значение ячейки как строка (числовые названия моделей: 3, 500.0 -> '500')
+    """
+    if value is None or isinstance(value, str):
+        return value
+    if pd.isna(value):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+def read_excel_chunks(file: BinaryIO, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """
+        Потоковое чтение Excel пачками по chunk_size строк
+
+        Книга открывается в режиме read-only: строки читаются с диска по мере
+        обхода, в памяти находится только текущая пачка. Пачка — DataFrame
+        с колонками CARS_COLUMNS, индекс — номер строки после заголовка (с 0).
+    """
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        positions = {name: index for index, name in enumerate(header) if name in CARS_COLUMNS}
+        columns = [positions.get(name) for name in CARS_COLUMNS]
+
+        chunk, row_numbers = [], []
+        for row_number, row in enumerate(rows):
+            item = tuple(
+                _cell_value(row[index]) if index is not None and index < len(row) else None
+                for index in columns
+            )
+            # Пустые строки в конце листа
+            if not any(item):
+                continue
+            chunk.append(item)
+            row_numbers.append(row_number)
+            if len(chunk) >= chunk_size:
+                yield pd.DataFrame(chunk, columns=CARS_COLUMNS, index=row_numbers)
+                chunk, row_numbers = [], []
+        if chunk:
+            yield pd.DataFrame(chunk, columns=CARS_COLUMNS, index=row_numbers)
+    finally:
+        workbook.close()
+
+
+def read_csv_chunks(file: BinaryIO, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """
+        Чтение CSV пачками парсером pandas на C
+
+        Разделитель определяется по началу файла, все значения читаются как строки
+        («NA», «null» в названиях не считаются пропусками).
+    """
+    sample = file.read(64 * 1024).decode('utf-8-sig', errors='ignore')
+    file.seek(0)
+    try:
+        delimiter = csv.Sniffer().sniff(sample.split('\n', 1)[0], delimiters=CSV_DELIMITERS).delimiter
+    except csv.Error:
+        delimiter = ','
+
+    chunks = pd.read_csv(
+        file,
+        sep=delimiter,
+        encoding='utf-8-sig',
+        dtype=str,
+        keep_default_na=False,
+        usecols=lambda name: name in CARS_COLUMNS,
+        chunksize=chunk_size,
+    )
+    with chunks:
+        for chunk in chunks:
+            yield chunk.reindex(columns=CARS_COLUMNS)
+
+
+def read_parquet_chunks(file: BinaryIO, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """
+        Чтение Parquet пачками по row group через pyarrow
+
+        Числовые колонки (модель 2107 типа double) приводятся к строкам как ячейки Excel.
+    """
+    parquet_file = pq.ParquetFile(file)
+    columns = [name for name in CARS_COLUMNS if name in parquet_file.schema_arrow.names]
+    start = 0
+    for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+        chunk = batch.to_pandas()
+        for column in chunk.columns:
+            if not pa.types.is_string(batch.schema.field(column).type):
+                chunk[column] = chunk[column].astype(object).map(_cell_value)
+        chunk.index = range(start, start + len(chunk))
+        start += len(chunk)
+        yield chunk.reindex(columns=CARS_COLUMNS)
+
+
+def read_chunks(file: BinaryIO, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """
+        Чтение справочника пачками: формат (Excel, Parquet, CSV) определяется по содержимому
+
+        Индекс пачки — номер строки файла (с 1, первая строка — заголовок) для всех форматов.
+        Пустой или нечитаемый файл — ValueError с описанием для пользователя.
+    """
+    magic = file.read(4)
+    file.seek(0)
+    if not magic:
+        raise ValueError('Файл пуст')
+    if magic == XLSX_MAGIC:
+        chunks = read_excel_chunks(file, chunk_size)
+    elif magic == PARQUET_MAGIC:
+        chunks = read_parquet_chunks(file, chunk_size)
+    else:
+        chunks = read_csv_chunks(file, chunk_size)
+
+    try:
+        while True:
+            try:
+                chunk = next(chunks, None)
+            except Exception as exc:
+                raise ValueError(f'Не удалось прочитать файл (ожидается Excel, CSV или Parquet): {exc}') from exc
+            if chunk is None:
+                return
+            chunk.index = chunk.index + FIRST_DATA_ROW
+            yield chunk
+    finally:
+        chunks.close()
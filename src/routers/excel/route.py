@@ -1,9 +1,8 @@
-import pandas as pd
-
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import APIRouter, Depends,UploadFile, File, status
 
 from src.routers.excel import (
+    utils,
     schemas,
     services,
 )
@@ -29,6 +28,17 @@ router = APIRouter(prefix='/excel', tags=['excel'])
                          }
                      }
                  },
+                 status.HTTP_400_BAD_REQUEST: {
+                     'description': 'Файл пуст или не является Excel, CSV или Parquet',
+                     'content': {
+                         'application/json': {
+                             'schema': {
+                                 'type': 'object',
+                                 'properties': {'detail': 'string'}
+                             }
+                         }
+                     }
+                 },
                  status.HTTP_500_INTERNAL_SERVER_ERROR: {
                      'description': 'Произошла ошибка при добавлении данных',
                      'content': {
@@ -41,34 +51,96 @@ router = APIRouter(prefix='/excel', tags=['excel'])
                      }
                  },
              },
-             description='Parse Cars from Excel File')
+             description='Parse Cars from Excel, CSV or Parquet File')
 async def parse_cars_from_excel(file: UploadFile = File(...),
                                 session: AsyncSession = Depends(get_async_session)):
     """
         Parse Cars From Excel File
     """
 
-    # Чтение файла Excel
-    df = pd.read_excel(file.file)
-
-    # Заменяем пустые строки на None
-    df = df.where(pd.notnull(df), None)
-
-    # Преобразование DataFrame в список словарей
-    data = df.to_dict(orient='records')
-
-    data = [schemas.CarsCreate(**item) for item in data]
-
-    # Добавление в БД
-    result = await services.add_cars_to_db(data, session)
-    if result:
+    # Чтение и добавление в БД пачками
+    try:
+        result = await utils.import_cars(file.file, session)
+    except ValueError as exc:
+        # Пустой или нечитаемый файл, часть пачек могла быть записана
+        utils.CarsCatalog.invalidate()
+        raise global_exceptions.MyHTTPException(
+            status=global_schemas.StatusResponseEnum.ERROR,
+            status_code=status.HTTP_400_BAD_REQUEST,
+            message=str(exc),
+        )
+    if result is not None:
+        # Справочник авто перестраивается в фоне
+        utils.CarsCatalog.invalidate()
         raise global_exceptions.MyHTTPException(
             status=global_schemas.StatusResponseEnum.SUCCESS,
             status_code=status.HTTP_201_CREATED,
-            message='Данные успешно добавленны',
+            message=(
+                f"Данные успешно добавленны (добавлено: {result['inserted']}, "
+                f"обновлено: {result['updated']}, пропущено: {result['skipped']})"
+            ),
         )
     raise global_exceptions.MyHTTPException(
         status=global_schemas.StatusResponseEnum.ERROR,
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         message='Произошла ошибка при добавлении данных',
     )
+
+
+@router.get(path='/cars-match',
+            status_code=status.HTTP_200_OK,
+            response_model=schemas.CarsMatchResponse,
+            description='Отладка сопоставления марки и модели: лучшие кандидаты с оценкой')
+async def match_cars(brand: str, model: str, limit: int = 5):
+    """
+        Match Cars Debug Service
+    """
+    items = await utils.CarsCatalog.match_car(brand, model, limit=limit)
+    return schemas.CarsMatchResponse(items=items)
+
+
+@router.post(path='/jobs',
+             status_code=status.HTTP_202_ACCEPTED,
+             response_model=schemas.ImportJobCreateResponse,
+             description='Parse Cars from Excel, CSV or Parquet File in Background')
+async def create_import_job(file: UploadFile = File(...),
+                            session: AsyncSession = Depends(get_async_session)):
+    """
+        Create Cars Import Job
+    """
+    job_id = await utils.CarsImportJobs.submit(file, session)
+    return schemas.ImportJobCreateResponse(id=job_id, status=schemas.ImportJobStatusEnum.PENDING)
+
+
+@router.get(path='/jobs/{job_id}',
+            status_code=status.HTTP_200_OK,
+            response_model=schemas.ImportJobResponse,
+            description='Get Cars Import Job Status')
+async def get_import_job(job_id: int,
+                         session: AsyncSession = Depends(get_async_session)):
+    """
+        Get Cars Import Job
+    """
+    result = await services.get_import_job(job_id, session)
+    if result is None:
+        raise global_exceptions.MyHTTPException(
+            status=global_schemas.StatusResponseEnum.ERROR,
+            status_code=status.HTTP_404_NOT_FOUND,
+            message='Задание не найдено',
+        )
+
+    job, duration = result
+    return schemas.ImportJobResponse(
+        id=job.id,
+        status=job.status,
+        filename=job.filename,
+        rows_processed=job.rows_processed,
+        inserted=job.inserted,
+        updated=job.updated,
+        skipped=job.skipped,
+        rows_per_second=round(job.rows_processed / float(duration), 1) if duration else None,
+        errors=job.errors,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
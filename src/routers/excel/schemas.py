@@ -1,17 +1,48 @@
+from enum import Enum
 from typing import Optional
-from pydantic import BaseModel, field_validator
-
-
-class CarsCreate(BaseModel):
-    brand: Optional[str] = None
-    model: Optional[str] = None
-    modif: Optional[str] = None
-    sk_brand: Optional[str] = None
-    sk_model: Optional[str] = None
-    type: Optional[str] = None
-
-    @field_validator('brand', 'model', 'modif', 'sk_brand', 'sk_model', 'type')
-    def blank_string(value, field):
-        if value == "":
-            return None
-        return value
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict
+
+
+class CarMatch(BaseModel):
+    model_config = ConfigDict(protected_namespaces=())
+
+    brand: str
+    model: str
+    brand_score: float
+    model_score: float
+    score: float
+
+
+class CarsMatchResponse(BaseModel):
+    items: list[CarMatch]
+
+
+class ImportJobStatusEnum(str, Enum):
+    """
+        Import Job Status
+    """
+    PENDING: str = 'pending'
+    RUNNING: str = 'running'
+    SUCCESS: str = 'success'
+    ERROR:   str = 'error'
+
+
+class ImportJobCreateResponse(BaseModel):
+    id: int
+    status: ImportJobStatusEnum
+
+
+class ImportJobResponse(BaseModel):
+    id: int
+    status: ImportJobStatusEnum
+    filename: Optional[str] = None
+    rows_processed: int
+    inserted: int
+    updated: int
+    skipped: int
+    rows_per_second: Optional[float] = None
+    errors: list[str]
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
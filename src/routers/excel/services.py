@@ -1,43 +1,117 @@
-from sqlalchemy import text, select, and_, func
+from sqlalchemy import text, select, update, insert, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.routers.excel import schemas
-from src.models import Cars
+from src.logger import logger
+from src.models import Cars, ImportJob
+from src.routers.excel.reader import CARS_COLUMNS
 
 
-async def add_cars_to_db(data: list[schemas.CarsCreate], session: AsyncSession):
+# Временная таблица загрузки, удаляется при завершении транзакции
+CREATE_STAGING = text(
+    "CREATE TEMP TABLE IF NOT EXISTS cars_staging ("
+    "position BIGSERIAL, brand TEXT, model TEXT, modif TEXT, "
+    "sk_brand TEXT, sk_model TEXT, type VARCHAR(5)"
+    ") ON COMMIT DROP"
+)
+
+# Перенос в cars по ключу (brand, model, modif): дубликаты внутри загрузки сводятся
+# к последней строке, существующие записи обновляются только при изменениях
+MERGE_STAGING = text(
+    "INSERT INTO cars (brand, model, modif, sk_brand, sk_model, type) "
+    "SELECT DISTINCT ON (brand, model, modif) brand, model, modif, sk_brand, sk_model, type "
+    "FROM cars_staging ORDER BY brand, model, modif, position DESC "
+    "ON CONFLICT ON CONSTRAINT uq_cars_brand_model_modif DO UPDATE SET "
+    "sk_brand = EXCLUDED.sk_brand, sk_model = EXCLUDED.sk_model, type = EXCLUDED.type "
+    "WHERE (cars.sk_brand, cars.sk_model, cars.type) "
+    "IS DISTINCT FROM (EXCLUDED.sk_brand, EXCLUDED.sk_model, EXCLUDED.type) "
+    "RETURNING (xmax = 0) AS inserted"
+)
+
+
+async def add_cars_to_db(data: list[tuple], session: AsyncSession) -> dict | None:
     """
-        Add Cars
+        Add Cars: COPY во временную таблицу и перенос в cars
+
+        Строки — кортежи значений в порядке CARS_COLUMNS.
+
+        Возвращает количество добавленных, обновленных и пропущенных строк, None при ошибке.
     """
     try:
-        data_execute = [item.model_dump() for item in data]
-        insert_stmt = text("INSERT INTO cars (brand, model, modif, sk_brand, sk_model, type) VALUES (:brand, :model, :modif, :sk_brand, :sk_model, :type) ON CONFLICT DO NOTHING")
-        await session.execute(insert_stmt, data_execute)
+        # Первый запрос открывает транзакцию, COPY выполняется в ней же
+        await session.execute(CREATE_STAGING)
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            'cars_staging',
+            records=data,
+            columns=CARS_COLUMNS,
+        )
+        result = await session.execute(MERGE_STAGING)
+        merged = result.scalars().all()
         await session.commit()
-        return True
-    except:
-        return False
+    except Exception as exc:
+        logger.error(exc)
+        await session.rollback()
+        return None
+
+    inserted = sum(merged)
+    return {
+        'inserted': inserted,
+        'updated': len(merged) - inserted,
+        'skipped': len(data) - len(merged),
+    }
 
 
-async def find_car_info(brand: str, model: str, session: AsyncSession):
+async def get_cars_names(session: AsyncSession):
     """
-        Get Car
+        Get Cars Brand, Model and Insurance Company Names
     """
-    query = select(Cars).where(
-        and_(
-            func.lower(Cars.brand) == brand.lower(),
-            func.lower(Cars.model) == model.lower()
+    query = select(Cars.brand, Cars.model, Cars.sk_brand, Cars.sk_model).order_by(Cars.id)
+    result = await session.execute(query)
+    return result.all()
+
+
+async def create_import_job(filename: str, session: AsyncSession) -> int:
+    """
+        Create Import Job
+    """
+    query = insert(ImportJob).values(filename=filename).returning(ImportJob.id)
+    result = await session.execute(query)
+    await session.commit()
+    return result.scalar_one()
+
+
+async def update_import_job(job_id: int, values: dict, session: AsyncSession):
+    """
+        Update Import Job
+    """
+    query = update(ImportJob).where(ImportJob.id == job_id).values(**values)
+    await session.execute(query)
+    await session.commit()
+
+
+async def fail_import_jobs(statuses: list[str], values: dict, session: AsyncSession) -> int:
+    """
+        Fail Import Jobs with given statuses
+    """
+    query = update(ImportJob).where(ImportJob.status.in_(statuses)).values(**values)
+    result = await session.execute(query)
+    await session.commit()
+    return result.rowcount
+
+
+async def get_import_job(job_id: int, session: AsyncSession):
+    """
+        Get Import Job with its duration in seconds
+    """
+    query = (
+        select(
+            ImportJob,
+            func.extract(
+                'epoch', func.coalesce(ImportJob.finished_at, func.now()) - ImportJob.started_at
+            ).label('duration'),
         )
+        .where(ImportJob.id == job_id)
     )
-
-    # Выполняем запрос и получаем первый найденный объект
     result = await session.execute(query)
-    car = result.scalars().first()  # Получаем только первый найденный объект
-
-    # Если объект найден, возвращаем его поля brand и model
-    if car:
-        return {
-            "brand": car.brand,
-            "model": car.model
-        }
-    return None
+    return result.one_or_none()
@@ -0,0 +1,436 @@
+import os
+import re
+import time
+import shutil
+import heapq
+import asyncio
+import tempfile
+from typing import Awaitable, BinaryIO, Callable
+from collections import defaultdict
+
+import pandas as pd
+from fastapi import UploadFile
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.logger import logger
+from src.config import settings
+from src.models import Cars
+from src.database import get_async_generator_session
+from src.routers.excel import (
+    reader,
+    schemas,
+    services,
+)
+
+_NOT_ALPHANUMERIC = re.compile(r'[^0-9a-zа-я]+')
+
+
+def normalize_name(text: str) -> str:
+    """
+        Нормализация названия: регистр, ё/е, без пробелов и знаков («Mercedes Benz» == «Mercedes-Benz»)
+    """
+    return _NOT_ALPHANUMERIC.sub('', (text or '').casefold().replace('ё', 'е'))
+
+
+def trigrams(text: str) -> set[str]:
+    padded = f'^{text}$'
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+class NgramIndex:
+    """
+        Инвертированный индекс триграмм, оценка совпадения — коэффициент Дайса
+
+        Кандидаты собираются по редким триграммам: списки длиннее MAX_POSTING («mod», «del»
+        у всех моделей вида «Model N») не обходятся, если кандидаты уже есть. Оценка считается
+        для MAX_RESCORE кандидатов с наибольшим числом общих редких триграмм.
+    """
+    MAX_POSTING = 1000
+    MAX_RESCORE = 50
+
+    def __init__(self):
+        self._values = []
+        self._texts = []
+        self._sizes = []
+        self._exact = defaultdict(list)
+        self._postings = defaultdict(list)
+
+    def add(self, value, text: str):
+        normalized = normalize_name(text)
+        if not normalized:
+            return
+        # Повторы синонима (sk_brand в каждой строке марки) не раздувают индекс
+        if any(self._values[position] == value for position in self._exact.get(normalized, ())):
+            return
+        position = len(self._values)
+        grams = trigrams(normalized)
+        self._values.append(value)
+        self._texts.append(f'^{normalized}$')
+        self._sizes.append(len(grams))
+        self._exact[normalized].append(position)
+        for gram in grams:
+            self._postings[gram].append(position)
+
+    def search(self, text: str, limit: int = 5) -> list[tuple]:
+        """
+            Поиск: [(значение, оценка 0..1)] по убыванию оценки
+        """
+        normalized = normalize_name(text)
+        if not normalized:
+            return []
+
+        scores = {}
+        for position in self._exact.get(normalized, ()):
+            scores[self._values[position]] = 1.0
+
+        grams = trigrams(normalized)
+        counts = defaultdict(int)
+        skipped = []
+        for gram in sorted(grams, key=lambda item: len(self._postings.get(item, ()))):
+            posting = self._postings.get(gram, ())
+            if counts and len(posting) > self.MAX_POSTING:
+                skipped.append(gram)
+                continue
+            for position in posting:
+                counts[position] += 1
+
+        # Общие частые триграммы досчитываются по тексту кандидата
+        for position in heapq.nlargest(self.MAX_RESCORE, counts, key=counts.__getitem__):
+            padded = self._texts[position]
+            count = counts[position] + sum(gram in padded for gram in skipped)
+            score = 2 * count / (len(grams) + self._sizes[position])
+            value = self._values[position]
+            if score > scores.get(value, 0):
+                scores[value] = score
+
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+
+class CarsMatcher:
+    """
+        Нечеткое сопоставление марки и модели со справочником cars
+
+        Марка ищется по brand, sk_brand и синонимам (CARS_BRAND_ALIASES),
+        модель — по model и sk_model в пределах найденных марок.
+        Оценка кандидата — минимум оценок марки и модели: точная марка не
+        вытягивает похожую, но другую модель («Model 3» -> «Model S»).
+    """
+
+    def __init__(self, rows: list[tuple]):
+        """
+            Построение индексов
+        """
+        self._brands = NgramIndex()
+        self._models = defaultdict(NgramIndex)
+        brands, models = {}, {}
+
+        for brand, model, sk_brand, sk_model in rows:
+            if not brand:
+                continue
+            brand_key = normalize_name(brand)
+            if brand_key not in brands:
+                brands[brand_key] = brand
+                self._brands.add(brand, brand)
+            canonical_brand = brands[brand_key]
+            if sk_brand:
+                self._brands.add(canonical_brand, sk_brand)
+
+            if not model:
+                continue
+            model_key = (brand_key, normalize_name(model))
+            if model_key not in models:
+                models[model_key] = model
+                self._models[canonical_brand].add(model, model)
+            if sk_model:
+                self._models[canonical_brand].add(models[model_key], sk_model)
+
+        for alias, target in settings.CARS_BRAND_ALIASES.items():
+            if normalize_name(target) in brands:
+                self._brands.add(brands[normalize_name(target)], alias)
+
+    def match(self, brand: str, model: str, limit: int = 5) -> list[dict]:
+        """
+            Лучшие кандидаты (марка, модель) с оценкой
+        """
+        brands = self._brands.search(brand, limit=3)
+        # Марка найдена точно (или синоним) — модели ищутся только у нее
+        if brands and brands[0][1] == 1.0:
+            brands = [item for item in brands if item[1] == 1.0]
+
+        candidates = []
+        for candidate_brand, brand_score in brands:
+            for candidate_model, model_score in self._models[candidate_brand].search(model, limit=limit):
+                candidates.append({
+                    'brand': candidate_brand,
+                    'model': candidate_model,
+                    'brand_score': round(brand_score, 3),
+                    'model_score': round(model_score, 3),
+                    'score': round(min(brand_score, model_score), 3),
+                })
+        candidates.sort(key=lambda item: (item['score'], item['brand_score'] + item['model_score']), reverse=True)
+        return candidates[:limit]
+
+
+class CarsCatalog:
+    """
+        Справочник авто в памяти процесса
+
+        Соответствие (марка, модель) в нижнем регистре -> марка и модель из таблицы cars.
+        Загружается при старте, после импорта и по истечении CARS_CATALOG_TTL (чтобы подхватить
+        импорт, выполненный другим воркером) перестраивается фоновой задачей: запросы до замены
+        используют текущий справочник, ждет загрузки только первый запрос без справочника.
+        Перечитывается всегда из основной БД: реплика может еще не получить только что
+        загруженные авто.
+    """
+    _cars = None
+    _matcher = None
+    _loaded_at = 0.0
+    _lock = asyncio.Lock()
+    _task = None
+    _stale = False
+
+    @staticmethod
+    def normalize(brand: str, model: str) -> tuple[str, str]:
+        return (brand or '').lower(), (model or '').lower()
+
+    @classmethod
+    async def load(cls, session: AsyncSession):
+        """
+            Загрузка справочника из Базы Данных
+        """
+        rows = await services.get_cars_names(session)
+        cars = {}
+        for brand, model, _, _ in rows:
+            # При совпадении марки и модели берется первая запись по id
+            cars.setdefault(cls.normalize(brand, model), {'brand': brand, 'model': model})
+        matcher = await asyncio.to_thread(CarsMatcher, rows)
+        cls._cars, cls._matcher = cars, matcher
+        cls._loaded_at = time.monotonic()
+        logger.info(f'Cars catalog is loaded ({len(cars)} items)')
+
+    @classmethod
+    def invalidate(cls):
+        """
+            Перестроение справочника в фоне, до замены используется текущий
+        """
+        cls._stale = True
+        if cls._task is None or cls._task.done():
+            cls._task = asyncio.create_task(cls._reload(), name='cars-catalog')
+
+    @classmethod
+    async def _reload(cls):
+        # Сброс во время загрузки (импорт завершился позже чтения) — загрузка повторяется
+        while cls._stale:
+            cls._stale = False
+            try:
+                async with get_async_generator_session() as session:
+                    await cls.load(session)
+            except Exception as exc:
+                # Текущий справочник используется до следующей попытки через CARS_CATALOG_TTL
+                logger.error(f'Cars catalog is not reloaded: {exc!r}')
+                cls._loaded_at = time.monotonic()
+                return
+
+    @classmethod
+    async def stop(cls):
+        """
+            Остановка фонового перестроения
+        """
+        if cls._task is not None:
+            cls._task.cancel()
+            await asyncio.gather(cls._task, return_exceptions=True)
+            cls._task = None
+
+    @classmethod
+    async def _ensure_loaded(cls):
+        if cls._cars is None:
+            async with cls._lock:
+                if cls._cars is None:
+                    async with get_async_generator_session() as session:
+                        await cls.load(session)
+        elif time.monotonic() - cls._loaded_at > settings.CARS_CATALOG_TTL and (cls._task is None or cls._task.done()):
+            cls.invalidate()
+
+    @classmethod
+    async def match_car(cls, brand: str, model: str, limit: int = 5) -> list[dict]:
+        """
+            Кандидаты нечеткого сопоставления
+        """
+        await cls._ensure_loaded()
+        return cls._matcher.match(brand, model, limit=limit)
+
+    @classmethod
+    async def find_car_info(cls, brand: str, model: str):
+        """
+            Get Car: точное совпадение без учета регистра, затем лучший нечеткий кандидат
+        """
+        await cls._ensure_loaded()
+        car = cls._cars.get(cls.normalize(brand, model))
+        if car:
+            return car
+
+        # Ввод заменяется, только если лучший кандидат надежен и явно лучше следующего
+        candidates = cls._matcher.match(brand, model, limit=2)
+        if not candidates or candidates[0]['score'] < settings.CARS_MATCH_THRESHOLD:
+            return None
+        if len(candidates) > 1 and candidates[0]['score'] - candidates[1]['score'] < settings.CARS_MATCH_MARGIN:
+            logger.info(f'Car {brand} {model} is ambiguous: {candidates}')
+            return None
+        logger.info(f'Car {brand} {model} is matched to {candidates[0]}')
+        return {'brand': candidates[0]['brand'], 'model': candidates[0]['model']}
+
+
+_WHITESPACE = r'\s+'
+_TYPE_LENGTH = Cars.__table__.c.type.type.length
+
+
+def clean_cars_frame(frame: pd.DataFrame) -> tuple[list[tuple], list[str]]:
+    """
+        Очистка пачки справочника по колонкам
+
+        Пробелы по краям и повторные пробелы убираются, пустые строки заменяются на None,
+        тип приводится к верхнему регистру. Строки без марки и с типом длиннее
+        колонки cars.type отбрасываются и попадают в список ошибок.
+        Возвращает кортежи значений в порядке CARS_COLUMNS и ошибки.
+    """
+    frame = frame.astype('string')
+    for column in reader.CARS_COLUMNS:
+        frame[column] = frame[column].str.strip().str.replace(_WHITESPACE, ' ', regex=True).replace('', pd.NA)
+    frame['type'] = frame['type'].str.upper()
+
+    # Строка только с маркой — допустимая запись справочника (синоним sk_brand)
+    no_brand = frame['brand'].isna()
+    long_type = (frame['type'].str.len() > _TYPE_LENGTH).fillna(False)
+    errors = [f'Строка {row}: не указана марка' for row in frame.index[no_brand]]
+    errors += [f'Строка {row}: тип длиннее {_TYPE_LENGTH} символов' for row in frame.index[long_type & ~no_brand]]
+
+    frame = frame[~(no_brand | long_type)].astype(object)
+    frame = frame.where(frame.notna(), None)
+    return list(frame.itertuples(index=False, name=None)), errors
+
+
+async def import_cars(file: BinaryIO, session: AsyncSession,
+                      progress: Callable[[int, dict], Awaitable] = None) -> dict | None:
+    """
+        Потоковый импорт справочника авто (Excel, CSV, Parquet): чтение, проверка и запись пачками
+
+        Пачка читается в отдельном потоке, чтобы не блокировать event loop,
+        следующая читается только после записи предыдущей.
+        После каждой пачки вызывается progress(обработано строк, счетчики).
+        Возвращает количество добавленных, обновленных и пропущенных (в том числе ошибочных)
+        строк и ошибки строк, None при ошибке записи.
+    """
+    chunks = reader.read_chunks(file, settings.CARS_IMPORT_CHUNK_SIZE)
+    counts = {'inserted': 0, 'updated': 0, 'skipped': 0, 'errors': []}
+    rows = 0
+    while True:
+        chunk = await asyncio.to_thread(next, chunks, None)
+        if chunk is None:
+            break
+        data, errors = clean_cars_frame(chunk)
+        result = await services.add_cars_to_db(data, session) if data else {}
+        if result is None:
+            chunks.close()
+            return None
+        rows += len(chunk)
+        for key, value in result.items():
+            counts[key] += value
+        counts['skipped'] += len(errors)
+        counts['errors'] += errors[:settings.CARS_IMPORT_MAX_ERRORS - len(counts['errors'])]
+        if progress is not None:
+            await progress(rows, counts)
+    logger.info(f"Cars import is finished ({rows} rows, {len(counts['errors'])} errors)")
+    return counts
+
+
+class CarsImportJobs:
+    """
+        Фоновый импорт справочника авто
+
+        Файл сохраняется во временный каталог, импорт выполняется задачей event loop
+        с отдельной сессией, состояние задания хранится в таблице import_job.
+    """
+    _tasks = set()
+
+    @classmethod
+    async def submit(cls, file: UploadFile, session: AsyncSession) -> int:
+        """
+            Создание задания импорта
+        """
+        # UploadFile закрывается после ответа, поэтому файл копируется
+        suffix = os.path.splitext(file.filename or '')[1]
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp_file:
+            await asyncio.to_thread(shutil.copyfileobj, file.file, tmp_file)
+
+        job_id = await services.create_import_job(file.filename, session)
+        task = asyncio.create_task(cls._run(job_id, tmp_file.name), name=f'cars-import:{job_id}')
+        cls._tasks.add(task)
+        task.add_done_callback(cls._tasks.discard)
+        return job_id
+
+    @classmethod
+    async def _run(cls, job_id: int, path: str):
+        """
+            Выполнение задания импорта
+        """
+        async with get_async_generator_session() as session:
+            async def progress(rows: int, counts: dict):
+                await services.update_import_job(job_id, {'rows_processed': rows, **counts}, session)
+
+            try:
+                await services.update_import_job(
+                    job_id,
+                    {'status': schemas.ImportJobStatusEnum.RUNNING.value, 'started_at': func.now()},
+                    session,
+                )
+                with open(path, 'rb') as file:
+                    result = await import_cars(file, session, progress=progress)
+                if result is None:
+                    raise RuntimeError('Произошла ошибка при добавлении данных')
+                values = {'status': schemas.ImportJobStatusEnum.SUCCESS.value}
+            except asyncio.CancelledError:
+                values = {
+                    'status': schemas.ImportJobStatusEnum.ERROR.value,
+                    'errors': ['Импорт прерван остановкой сервиса'],
+                }
+                raise
+            except Exception as exc:
+                logger.error(f'Cars import job {job_id}: {exc}')
+                values = {'status': schemas.ImportJobStatusEnum.ERROR.value, 'errors': [str(exc)]}
+            finally:
+                os.remove(path)
+                # Часть пачек могла быть записана и при ошибке
+                CarsCatalog.invalidate()
+                await session.rollback()
+                await services.update_import_job(job_id, {**values, 'finished_at': func.now()}, session)
+
+    @classmethod
+    async def recover(cls, session: AsyncSession) -> int:
+        """
+            Завершение заданий, прерванных падением процесса
+
+            Задания выполняются только в процессе сервиса, поэтому при запуске
+            незавершенные задания уже не выполнятся и переводятся в error.
+        """
+        count = await services.fail_import_jobs(
+            [schemas.ImportJobStatusEnum.PENDING.value, schemas.ImportJobStatusEnum.RUNNING.value],
+            {
+                'status': schemas.ImportJobStatusEnum.ERROR.value,
+                'errors': ['Импорт прерван перезапуском сервиса'],
+                'finished_at': func.now(),
+            },
+            session,
+        )
+        if count:
+            logger.warning(f'Cars import jobs interrupted by restart: {count}')
+        return count
+
+    @classmethod
+    async def stop(cls):
+        """
+            Остановка выполняющихся заданий
+        """
+        for task in cls._tasks:
+            task.cancel()
+        await asyncio.gather(*cls._tasks, return_exceptions=True)
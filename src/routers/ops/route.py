@@ -0,0 +1,26 @@
+from fastapi import APIRouter, status
+
+from src.database import get_pool_stats
+from src.schemas import schemas as global_schemas
+from src.exceptions import exceptions as global_exceptions
+
+
+router = APIRouter(prefix='/ops', tags=['ops'])
+
+
+@router.get(path='/db-pool-stats',
+            status_code=status.HTTP_200_OK,
+            response_model=global_schemas.PoolStatsResponse,
+            description='Состояние пула соединений с Базой Данных')
+async def get_db_pool_stats(read: bool = False):
+    """
+        Get DB Pool Stats Service
+    """
+    stats = get_pool_stats(read)
+    if stats is None:
+        raise global_exceptions.MyHTTPException(
+            status=global_schemas.StatusResponseEnum.ERROR,
+            status_code=status.HTTP_404_NOT_FOUND,
+            message='Реплика для чтения не настроена',
+        )
+    return global_schemas.PoolStatsResponse(**stats)
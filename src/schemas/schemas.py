@@ -18,3 +18,27 @@ class ResponseBase(BaseModel):
     """
     status: StatusResponseEnum = StatusResponseEnum.SUCCESS
     message: str
+
+
+class PoolWait(BaseModel):
+    """
+        Schema Connection Wait
+    """
+    wait_ms: float
+    at: str
+
+
+class PoolStatsResponse(BaseModel):
+    """
+        Schema Response Connection Pool Stats
+    """
+    pool_size: int
+    max_overflow: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    acquisitions: int
+    timeouts: int
+    wait_avg_ms: float
+    wait_max_ms: float
+    slowest: list[PoolWait]
@@ -0,0 +1,102 @@
+import io
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+import pandas as pd
+from openpyxl import Workbook
+from sqlalchemy.dialects import postgresql
+
+from src.routers.excel import reader, utils
+
+
+def frame(rows: list[tuple], start: int = 2) -> pd.DataFrame:
+    return pd.DataFrame(rows, columns=reader.CARS_COLUMNS, index=range(start, start + len(rows)))
+
+
+def test_brand_only_row_is_kept():
+    data, errors = utils.clean_cars_frame(frame([
+        (' BMW ', None, None, 'БМВ', None, None),
+        (None, 'X5', None, None, None, None),
+    ]))
+
+    assert data == [('BMW', None, None, 'БМВ', None, None)]
+    assert errors == ['Строка 3: не указана марка']
+
+
+def write_file(file_format: str, rows: list[dict]) -> io.BytesIO:
+    file = io.BytesIO()
+    data = pd.DataFrame(rows)
+    if file_format == 'xlsx':
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.append(list(data.columns))
+        for row in data.itertuples(index=False, name=None):
+            sheet.append([None if pd.isna(value) else value for value in row])
+        workbook.save(file)
+    elif file_format == 'csv':
+        # В тексте CSV числовая модель записана как есть: 2107
+        data.astype({'model': 'Int64'}).to_csv(file, sep=';', index=False)
+    else:
+        data.to_parquet(file, index=False)
+    file.seek(0)
+    return file
+
+
+@pytest.mark.parametrize('file_format', ['xlsx', 'csv', 'parquet'])
+def test_formats_report_the_same_file_row(file_format):
+    file = write_file(file_format, [
+        {'brand': 'Lada', 'model': 2107.0, 'type': 'b'},
+        {'brand': None, 'model': 2109.0, 'type': 'b'},
+    ])
+
+    chunks = list(reader.read_chunks(file, chunk_size=1))
+    results = [utils.clean_cars_frame(chunk) for chunk in chunks]
+
+    assert [list(chunk.index) for chunk in chunks] == [[2], [3]]
+    assert results[0][0] == [('Lada', '2107', None, None, None, 'B')]
+    assert results[1] == ([], ['Строка 3: не указана марка'])
+
+
+@pytest.mark.parametrize('content', [b'', b'PK\x03\x04not a workbook', b'PAR1broken'])
+def test_empty_or_broken_file_is_a_read_error(content):
+    with pytest.raises(ValueError):
+        list(reader.read_chunks(io.BytesIO(content), chunk_size=10))
+
+
+def test_clean_cars_frame_normalizes_values():
+    data, errors = utils.clean_cars_frame(frame([
+        ('  Mercedes   Benz ', ' GLE  350', '', None, None, ' truck '),
+        ('BMW', 'X5', None, None, None, 'TOOLONG'),
+    ]))
+
+    assert data == [('Mercedes Benz', 'GLE 350', None, None, None, 'TRUCK')]
+    assert errors == ['Строка 3: тип длиннее 5 символов']
+
+
+class RecordingSession:
+    def __init__(self, rowcount: int):
+        self.rowcount = rowcount
+        self.statements = []
+        self.commits = 0
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return SimpleNamespace(rowcount=self.rowcount)
+
+    async def commit(self):
+        self.commits += 1
+
+
+def test_recover_fails_unfinished_jobs():
+    session = RecordingSession(rowcount=2)
+
+    count = asyncio.run(utils.CarsImportJobs.recover(session))
+
+    compiled = session.statements[0].compile(dialect=postgresql.dialect())
+    assert count == 2
+    assert session.commits == 1
+    assert str(compiled).startswith('UPDATE import_job SET status=')
+    assert 'finished_at=now()' in str(compiled)
+    assert compiled.params['status'] == 'error'
+    assert compiled.params['status_1'] == ['pending', 'running']
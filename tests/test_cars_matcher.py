@@ -0,0 +1,120 @@
+import asyncio
+import contextlib
+
+from src.routers.excel import utils
+
+CARS = [
+    ('Tesla', 'Model S', None, None),
+    ('Tesla', 'Model X', None, None),
+    ('Toyota', 'Land Cruiser Prado', None, None),
+    ('Toyota', 'Camry', None, None),
+    ('Mercedes-Benz', 'GLE 350', 'Mercedes', 'GLE'),
+    ('Volkswagen', 'Tiguan', None, None),
+    ('BMW', 'X5', None, None),
+    ('BMW', 'X6', None, None),
+]
+
+
+def find_car_info(brand: str, model: str):
+    utils.CarsCatalog._cars = {utils.CarsCatalog.normalize(row[0], row[1]): {'brand': row[0], 'model': row[1]} for row in CARS}
+    utils.CarsCatalog._matcher = utils.CarsMatcher(CARS)
+    utils.CarsCatalog._loaded_at = float('inf')
+    try:
+        return asyncio.run(utils.CarsCatalog.find_car_info(brand, model))
+    finally:
+        utils.CarsCatalog._cars = None
+
+
+def test_spelling_variants_are_matched():
+    assert find_car_info('Mercedes Benz', 'GLE350') == {'brand': 'Mercedes-Benz', 'model': 'GLE 350'}
+    assert find_car_info('VW', 'Tiguan') == {'brand': 'Volkswagen', 'model': 'Tiguan'}
+    assert find_car_info('bmw', 'x 5') == {'brand': 'BMW', 'model': 'X5'}
+
+
+def test_other_model_of_exact_brand_is_not_matched():
+    assert find_car_info('Tesla', 'Model 3') is None
+    assert find_car_info('Toyota', 'Land Cruiser 200') is None
+    assert find_car_info('Toyota', 'Camry Hybrid') is None
+
+
+def test_score_is_limited_by_model():
+    candidate = utils.CarsMatcher(CARS).match('Tesla', 'Model 3', limit=1)[0]
+
+    assert candidate['brand_score'] == 1.0
+    assert candidate['score'] == candidate['model_score']
+
+
+def setup_primary(monkeypatch, rows: list, loaded: asyncio.Event = None):
+    sessions = []
+
+    @contextlib.asynccontextmanager
+    async def primary_session():
+        sessions.append('primary')
+        yield 'primary'
+
+    async def get_cars_names(session):
+        assert session == 'primary'
+        if loaded is not None:
+            await loaded.wait()
+        return rows
+
+    monkeypatch.setattr(utils, 'get_async_generator_session', primary_session)
+    monkeypatch.setattr(utils.services, 'get_cars_names', get_cars_names)
+    monkeypatch.setattr(utils.CarsCatalog, '_cars', None)
+    monkeypatch.setattr(utils.CarsCatalog, '_matcher', None)
+    monkeypatch.setattr(utils.CarsCatalog, '_task', None)
+    return sessions
+
+
+def test_cold_catalog_is_loaded_from_primary(monkeypatch):
+    sessions = setup_primary(monkeypatch, CARS)
+
+    car = asyncio.run(utils.CarsCatalog.find_car_info('bmw', 'x5'))
+
+    assert car == {'brand': 'BMW', 'model': 'X5'}
+    assert sessions == ['primary']
+
+
+def test_invalidated_catalog_is_served_until_rebuilt(monkeypatch):
+    loaded = asyncio.Event()
+    sessions = setup_primary(monkeypatch, CARS + [('Lada', '2107', None, None)], loaded)
+    monkeypatch.setattr(utils.CarsCatalog, '_cars', {utils.CarsCatalog.normalize('BMW', 'X5'): {'brand': 'BMW', 'model': 'X5'}})
+    monkeypatch.setattr(utils.CarsCatalog, '_matcher', utils.CarsMatcher(CARS))
+
+    async def scenario():
+        utils.CarsCatalog.invalidate()
+        await asyncio.sleep(0)
+        # Пока справочник перестраивается, запросы не ждут и видят текущий
+        before = await utils.CarsCatalog.find_car_info('lada', '2107')
+        cached = await utils.CarsCatalog.find_car_info('bmw', 'x5')
+        loaded.set()
+        await utils.CarsCatalog._task
+        return before, cached, await utils.CarsCatalog.find_car_info('lada', '2107')
+
+    before, cached, after = asyncio.run(scenario())
+
+    assert before is None
+    assert cached == {'brand': 'BMW', 'model': 'X5'}
+    assert after == {'brand': 'Lada', 'model': '2107'}
+    assert sessions == ['primary']
+
+
+def test_common_trigrams_are_counted_for_candidates(monkeypatch):
+    monkeypatch.setattr(utils.NgramIndex, 'MAX_POSTING', 2)
+    index = utils.NgramIndex()
+    for number in range(10):
+        index.add(f'Model {number}5', f'Model {number}5')
+
+    value, score = index.search('Modle 35', limit=1)[0]
+
+    # Оценка та же, что по всем триграммам
+    expected = utils.trigrams(utils.normalize_name('Modle 35'))
+    candidate = utils.trigrams(utils.normalize_name('Model 35'))
+    assert value == 'Model 35'
+    assert score == 2 * len(expected & candidate) / (len(expected) + len(candidate))
+
+
+def test_repeated_alias_is_indexed_once():
+    matcher = utils.CarsMatcher([('BMW', f'X{number}', 'БМВ', None) for number in range(100)])
+
+    assert len(matcher._brands._values) == 2
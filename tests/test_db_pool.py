@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.util import greenlet_spawn
+
+from src.database.pool import ObservedPool
+
+
+class FakeConnection:
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def checkout(pool: ObservedPool, count: int):
+    async def run():
+        connections = []
+        try:
+            for _ in range(count):
+                connections.append(await greenlet_spawn(pool.connect))
+        finally:
+            for connection in connections:
+                await greenlet_spawn(connection.close)
+    asyncio.run(run())
+
+
+def test_pool_timeout_is_counted():
+    pool = ObservedPool(FakeConnection, pool_size=1, max_overflow=0, timeout=0.01)
+
+    with pytest.raises(exc.TimeoutError):
+        checkout(pool, 2)
+
+    assert pool.stats()['timeouts'] == 1
+    assert pool.stats()['acquisitions'] == 2
+
+
+def test_connect_error_is_not_a_timeout():
+    def connect():
+        raise ConnectionRefusedError('connection refused')
+
+    pool = ObservedPool(connect, pool_size=1, max_overflow=0, timeout=0.01)
+
+    with pytest.raises(ConnectionRefusedError):
+        checkout(pool, 1)
+
+    assert pool.stats()['timeouts'] == 0
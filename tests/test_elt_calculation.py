@@ -0,0 +1,126 @@
+import asyncio
+
+from src.routers.elt import utils
+from src.schemas import schemas as global_schemas
+
+
+class FakeService:
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.calls = 0
+
+    async def PreliminaryKASKOCalculation(self, **request):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {'RequestId': request['InsuranceCompany'], 'PremiumSum': 100, 'Error': None}
+
+
+class FakeClient:
+    def __init__(self, delay: float = 0.01):
+        self.service = FakeService(delay)
+
+
+def calculate(service: utils.EltService, client, companies: list[str], semaphore: asyncio.Semaphore):
+    return [
+        service.calculate_company(client, 'PreliminaryKASKOCalculation', 'test', company,
+                                  {'Cost': 1, 'Companies': companies}, semaphore, refresh=True)
+        for company in companies
+    ]
+
+
+def test_calculation_uses_passed_client_after_close():
+    service = utils.EltService('user', 'password')
+    client = FakeClient()
+
+    async def run():
+        # Компании ждут семафор, пока другой расчет завершается и закрывает клиент
+        semaphore = asyncio.Semaphore(1)
+        tasks = [asyncio.ensure_future(call) for call in calculate(service, client, ['ВСК', 'Согласие', 'ИНГОССТРАХ'], semaphore)]
+        await asyncio.sleep(0)
+        await utils.EltService.close()
+        return await asyncio.gather(*tasks)
+
+    results = asyncio.run(run())
+
+    assert client.service.calls == 3
+    for result in results:
+        (company, info), = result.items()
+        assert info['status'] == global_schemas.StatusResponseEnum.SUCCESS, (company, info)
+
+
+def test_stream_ends_with_result_when_reso_fails():
+    service = utils.EltService('user', 'password')
+    companies = ['ВСК', 'Согласие', 'ИНГОССТРАХ', 'RESO_GARANTIJA']
+
+    async def get_client():
+        return FakeClient(delay=0)
+
+    async def get_rl_actions(data, companies, session):
+        # Так выглядит SOAP Fault: request() вернул None
+        return utils.serialize_object(None).get('QuoteID')
+
+    service.get_client = get_client
+    service.get_rl_actions = get_rl_actions
+
+    class Data:
+        calc_reso_id = 1
+        active_companies = companies
+        force_refresh = True
+
+        def model_dump(self, exclude=None):
+            return {'Cost': 1}
+
+    async def run():
+        return [event async for event in service.casco_calculation_stream('PreliminaryKASKOCalculation', 'test', Data(), None)]
+
+    events = asyncio.run(run())
+
+    assert [event['event'] for event in events] == ['company'] * len(companies) + ['result']
+    assert events[-1]['status'] == global_schemas.StatusResponseEnum.ERROR
+    assert events[-1]['saved'] is False
+
+
+def test_closing_stream_cancels_pending_companies():
+    service = utils.EltService('user', 'password')
+    companies = ['ВСК', 'Согласие', 'ИНГОССТРАХ']
+    cancelled = []
+
+    class SlowService:
+        async def PreliminaryKASKOCalculation(self, **request):
+            company = request['InsuranceCompany']
+            try:
+                await asyncio.sleep(0 if company == 'ВСК' else 60)
+            except asyncio.CancelledError:
+                cancelled.append(company)
+                raise
+            return {'RequestId': company, 'PremiumSum': 100, 'Error': None}
+
+    class SlowClient:
+        service = SlowService()
+
+    async def get_client():
+        return SlowClient()
+
+    service.get_client = get_client
+
+    class Data:
+        calc_reso_id = 1
+        active_companies = companies
+        force_refresh = True
+
+        def model_dump(self, exclude=None):
+            return {'Cost': 1}
+
+    async def run():
+        stream = service.casco_calculation_stream('PreliminaryKASKOCalculation', 'test', Data(), None)
+        first = await anext(stream)
+        # Клиент отключился после первой СК
+        await stream.aclose()
+        await asyncio.sleep(0.01)
+        # Снимок до завершения event loop (asyncio.run отменяет оставшиеся задачи сам)
+        return first, list(cancelled)
+
+    first, cancelled_before_exit = asyncio.run(run())
+
+    assert first['company'] == 'ВСК'
+    assert sorted(cancelled_before_exit) == sorted(['Согласие', 'ИНГОССТРАХ'])
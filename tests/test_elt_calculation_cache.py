@@ -0,0 +1,73 @@
+import time
+import asyncio
+
+import pytest
+
+from src.config import settings
+from src.routers.elt import utils
+from src.routers.elt.cache import TTLCache
+from src.schemas import schemas as global_schemas
+
+METHOD = 'PreliminaryKASKOCalculation'
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(utils.EltService, '_results', TTLCache(maxsize=16))
+    monkeypatch.setattr(settings, 'ELT_HEDGE_ENABLED', False)
+    service = utils.EltService('user', 'password')
+    service.calls = []
+
+    async def request(client_, cache_id, method, params):
+        service.calls.append(params['InsuranceCompany'])
+        return {'RequestId': len(service.calls), 'PremiumSum': 100, 'Error': service.error}
+
+    service.error = None
+    service.request = request
+    return service
+
+
+def calculate(service: utils.EltService, company: str, params: dict, refresh: bool = False) -> dict:
+    coroutine = service.calculate_company(None, METHOD, 'test', company, params, asyncio.Semaphore(1), refresh)
+    return asyncio.run(coroutine)[company]
+
+
+def test_calculation_key_ignores_key_order():
+    assert utils.EltService.calculation_key({'Cost': 1, 'Mark': 'BMW'}) == \
+        utils.EltService.calculation_key({'Mark': 'BMW', 'Cost': 1})
+    assert utils.EltService.calculation_key({'Cost': 1}) != utils.EltService.calculation_key({'Cost': 2})
+
+
+def test_identical_input_is_served_from_cache(service):
+    first = calculate(service, 'ВСК', {'Cost': 1})
+    second = calculate(service, 'ВСК', {'Cost': 1})
+    other = calculate(service, 'ВСК', {'Cost': 2})
+
+    assert first['cached'] is False
+    assert second == {**first, 'cached': True}
+    assert other['cached'] is False
+    assert service.calls == ['ВСК', 'ВСК']
+
+
+def test_cached_result_expires(service, monkeypatch):
+    monkeypatch.setattr(settings, 'ELT_CALCULATION_CACHE_TTL', 0.05)
+    calculate(service, 'ВСК', {'Cost': 1})
+    time.sleep(0.1)
+
+    assert calculate(service, 'ВСК', {'Cost': 1})['cached'] is False
+    assert service.calls == ['ВСК', 'ВСК']
+
+
+def test_reso_refresh_and_refusals_are_not_cached(service):
+    for _ in range(2):
+        assert calculate(service, 'RESO_GARANTIJA', {'Cost': 1})['cached'] is False
+
+    calculate(service, 'ВСК', {'Cost': 1})
+    assert calculate(service, 'ВСК', {'Cost': 1}, refresh=True)['cached'] is False
+
+    service.error = 'Отказ'
+    refusal = calculate(service, 'Согласие', {'Cost': 1})
+    assert refusal['status'] == global_schemas.StatusResponseEnum.SUCCESS
+    assert calculate(service, 'Согласие', {'Cost': 1})['cached'] is False
+
+    assert service.calls == ['RESO_GARANTIJA', 'RESO_GARANTIJA', 'ВСК', 'ВСК', 'Согласие', 'Согласие']
@@ -0,0 +1,75 @@
+import asyncio
+import contextlib
+from types import SimpleNamespace
+
+from src.config import settings
+from src.routers.elt import utils, services
+from src.routers.elt.cache import TTLCache
+
+METHOD = 'GetBanks'
+
+
+def setup_service(monkeypatch, age: float):
+    ttl = settings.ELT_CACHE_TTL[METHOD]
+    calls = []
+
+    async def get_elt_dictionary(method, params, session):
+        return SimpleNamespace(data=[{'Id': 1}], fetched_at='2026-10-18', age=age)
+
+    async def call(client_, method, params=None):
+        calls.append(method)
+        return [{'Id': 2}]
+
+    @contextlib.asynccontextmanager
+    async def session():
+        yield None
+
+    monkeypatch.setattr(services, 'get_elt_dictionary', get_elt_dictionary)
+    monkeypatch.setattr(utils, 'get_async_generator_session', session)
+    monkeypatch.setattr(utils.SoapServiceAsync, 'call', classmethod(lambda cls, *args, **kwargs: call(*args, **kwargs)))
+    monkeypatch.setattr(utils.SoapServiceAsync, '_cache', TTLCache(maxsize=16))
+    return ttl, calls
+
+
+def test_stored_row_is_cached_for_remaining_ttl(monkeypatch):
+    ttl, calls = setup_service(monkeypatch, age=600)
+
+    data = asyncio.run(utils.SoapServiceAsync.request(None, 'banks', METHOD))
+
+    assert data == [{'Id': 1}]
+    assert calls == []
+    remaining = utils.SoapServiceAsync._cache.remaining(utils.SoapServiceAsync.cache_key(METHOD, None))
+    assert ttl - 600 - 5 < remaining <= ttl - 600
+
+
+def test_warmer_first_pass_reads_database(monkeypatch):
+    ttl, calls = setup_service(monkeypatch, age=0)
+    soap = utils.SoapServiceAsync('user', 'password')
+
+    async def run():
+        remaining = await soap.warm(None, METHOD)
+        # Повторное обновление идет в ELT
+        await soap.refresh(None, METHOD)
+        return remaining
+
+    remaining = asyncio.run(run())
+
+    assert 0 < remaining <= ttl
+    assert calls == [METHOD]
+
+
+def test_stale_row_is_cached_briefly_when_elt_is_down(monkeypatch):
+    ttl, calls = setup_service(monkeypatch, age=settings.ELT_CACHE_TTL[METHOD] * 2)
+
+    async def call(cls, client_, method, params=None):
+        calls.append(method)
+        return None
+
+    monkeypatch.setattr(utils.SoapServiceAsync, 'call', classmethod(call))
+
+    data = asyncio.run(utils.SoapServiceAsync.request(None, 'banks', METHOD))
+
+    assert data == [{'Id': 1}]
+    assert calls == [METHOD]
+    remaining = utils.SoapServiceAsync._cache.remaining(utils.SoapServiceAsync.cache_key(METHOD, None))
+    assert remaining <= settings.ELT_STALE_TTL < ttl
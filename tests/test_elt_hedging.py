@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from src.config import settings
+from src.routers.elt import utils
+
+METHOD = 'PreliminaryKASKOCalculation'
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(utils.EltService, '_latencies', {})
+    monkeypatch.setattr(settings, 'ELT_HEDGE_ENABLED', True)
+    monkeypatch.setattr(settings, 'ELT_HEDGE_MIN_SAMPLES', 3)
+    monkeypatch.setattr(settings, 'ELT_HEDGE_PERCENTILE', 0.5)
+    return utils.EltService('user', 'password')
+
+
+def test_hedge_delay_needs_samples(service, monkeypatch):
+    for latency in (0.3, 0.1):
+        service.record_latency(METHOD, 'ВСК', latency)
+    assert service.get_hedge_delay(METHOD, 'ВСК') is None
+
+    service.record_latency(METHOD, 'ВСК', 0.2)
+    assert service.get_hedge_delay(METHOD, 'ВСК') == 0.2
+    assert service.get_hedge_delay(METHOD, 'Согласие') is None
+
+    monkeypatch.setattr(settings, 'ELT_HEDGE_ENABLED', False)
+    assert service.get_hedge_delay(METHOD, 'ВСК') is None
+
+
+def test_hedge_fires_after_delay_and_cancels_loser(service):
+    for _ in range(3):
+        service.record_latency(METHOD, 'ВСК', 0.01)
+    calls, cancelled = [], []
+
+    async def request(client_, cache_id, method, params):
+        number = len(calls)
+        calls.append(number)
+        try:
+            # Первый запрос «завис», дублирующий отвечает сразу
+            await asyncio.sleep(60 if number == 0 else 0)
+        except asyncio.CancelledError:
+            cancelled.append(number)
+            raise
+        return {'RequestId': number}
+
+    service.request = request
+
+    async def run():
+        result = await service.hedged_request(None, 'test', METHOD, 'ВСК', {})
+        await asyncio.sleep(0)
+        return result, list(cancelled)
+
+    (result, hedged), cancelled_before_exit = asyncio.run(run())
+
+    assert result == {'RequestId': 1}
+    assert hedged is True
+    assert calls == [0, 1]
+    assert cancelled_before_exit == [0]
+
+
+def test_fast_response_is_not_hedged(service):
+    for _ in range(3):
+        service.record_latency(METHOD, 'ВСК', 0.5)
+    calls = []
+
+    async def request(client_, cache_id, method, params):
+        calls.append(method)
+        return {'RequestId': 1}
+
+    service.request = request
+
+    result, hedged = asyncio.run(service.hedged_request(None, 'test', METHOD, 'ВСК', {}))
+
+    assert result == {'RequestId': 1}
+    assert hedged is False
+    assert calls == [METHOD]
+
+
+def test_hedge_errors_propagate(service):
+    for _ in range(3):
+        service.record_latency(METHOD, 'ВСК', 0.01)
+
+    async def request(client_, cache_id, method, params):
+        await asyncio.sleep(0.05)
+        raise ConnectionError('ELT is unavailable')
+
+    service.request = request
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(service.hedged_request(None, 'test', METHOD, 'ВСК', {}))
@@ -0,0 +1,105 @@
+import asyncio
+
+from src.models import InsuranceElt
+from src.routers.elt import services
+from src.routers.elt import schemas
+from src.schemas import schemas as global_schemas
+
+# Обязательные колонки insurance_elt (NOT NULL в миграции)
+REQUIRED_COLUMNS = ('RequestId', 'PremiumSum', 'KASKOSum', 'DOSum', 'GOSum', 'NSSum', 'GAPSum')
+
+
+def company_success(name: str, **data) -> dict:
+    return {
+        name: {
+            'status': global_schemas.StatusResponseEnum.SUCCESS,
+            'outcome': schemas.CalculationOutcomeEnum.COMPLETED,
+            'cached': False,
+            'data': {
+                'RequestId': f'request-{name}',
+                'SKCalcId': '100',
+                'PremiumSum': 1000,
+                'KASKOSum': 900,
+                'DOSum': 0,
+                'GOSum': 0,
+                'NSSum': 0,
+                'GAPSum': 0,
+                'TotalFranchise': 0,
+                **data,
+            },
+        },
+    }
+
+
+def company_timeout(name: str) -> dict:
+    # Так calculate_company возвращает превышение времени ожидания
+    return {
+        name: {
+            'status': global_schemas.StatusResponseEnum.ERROR,
+            'outcome': schemas.CalculationOutcomeEnum.TIMEOUT,
+            'cached': False,
+            'data': {'message': 'Превышено время ожидания ответа СК'},
+        },
+    }
+
+
+CALCULATION = [
+    company_success('ВСК'),
+    company_timeout('Согласие'),
+    company_success('ИНГОССТРАХ', Error='Отказ', PremiumSum=None, KASKOSum=None, RequestId=None),
+    company_success('RESO_GARANTIJA'),
+]
+
+
+class FakeResult:
+    def scalar_one(self):
+        return 1
+
+
+class FakeSession:
+    def __init__(self):
+        self.statements = []
+        self.committed = False
+        self.rolled_back = False
+
+    async def execute(self, statement, *args):
+        self.statements.append(statement)
+        return FakeResult()
+
+    async def commit(self):
+        self.committed = True
+
+    async def rollback(self):
+        self.rolled_back = True
+
+
+def test_timeout_and_error_entries_are_skipped():
+    rows = services.build_insurance_elts(10, 1, CALCULATION)
+
+    assert [row['insurance_name'] for row in rows] == ['ВСК', 'ИНГОССТРАХ', 'RESO_GARANTIJA']
+
+
+def test_rows_satisfy_not_null_columns():
+    rows = services.build_insurance_elts(10, 1, CALCULATION)
+
+    for row in rows:
+        for column in REQUIRED_COLUMNS:
+            assert row[column] is not None, (row['insurance_name'], column)
+    # Отказ СК сохраняется с ошибкой и не попадает в котировки для Ресо
+    refused = next(row for row in rows if row['insurance_name'] == 'ИНГОССТРАХ')
+    assert refused['Error'] == 'Отказ'
+    assert set(REQUIRED_COLUMNS) | {'calc_id', 'insurance_id', 'insurance_name'} <= set(rows[0])
+    assert set(rows[0]) <= set(InsuranceElt.__table__.columns.keys())
+
+
+def test_calculation_with_timed_out_company_is_saved():
+    session = FakeSession()
+
+    asyncio.run(services.create_insurance_elt(10, 20, {'quote_id': 1, 'police_id': 2}, CALCULATION, session))
+
+    assert session.committed
+    assert not session.rolled_back
+    # upsert страхования, удаление прежних котировок, одна вставка котировок
+    assert len(session.statements) == 3
+    insert_params = session.statements[2].compile().params
+    assert not any(name.startswith('insurance_name') and value == 'Согласие' for name, value in insert_params.items())
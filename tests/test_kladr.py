@@ -0,0 +1,52 @@
+import pytest
+
+from src.routers.elt.kladr import KladrIndex, normalize_name
+
+REGIONS = [
+    {'Id': '50', 'Name': 'Московская обл.', 'Kladr': '5000000000000'},
+    {'Id': '52', 'Name': 'Нижегородская обл.', 'Kladr': '5200000000000'},
+    {'Id': '53', 'Name': 'Новгородская обл.', 'Kladr': '5300000000000'},
+    {'Id': '66', 'Name': 'Свердловская область', 'Kladr': '6600000000000'},
+]
+CITIES = {
+    '50': [{'Id': '501', 'Name': 'г. Королёв', 'Kladr': '5000001000000'}],
+    '52': [{'Id': '521', 'Name': 'г. Нижний Новгород', 'Kladr': '5200000100000'}],
+    '53': [{'Id': '531', 'Name': 'г. Великий Новгород', 'Kladr': '5300000100000'}],
+}
+
+
+@pytest.fixture(scope='module')
+def index():
+    return KladrIndex(REGIONS, CITIES)
+
+
+def names(items: list[dict]) -> list[str]:
+    return [item['Name'] for item in items]
+
+
+def test_address_types_are_ignored():
+    assert normalize_name('Московская обл.') == 'московская'
+    assert normalize_name('г. Королёв') == 'королев'
+    assert normalize_name('Свердловская область') == 'свердловская'
+
+
+def test_exact_match_comes_first(index):
+    assert names(index.lookup('Московская область')) == ['Московская обл.']
+    assert index.find_region('свердловская обл')['Id'] == '66'
+
+
+def test_prefix_of_any_word(index):
+    assert sorted(names(index.lookup('новгород', kind=KladrIndex.CITY))) == ['г. Великий Новгород', 'г. Нижний Новгород']
+    assert names(index.lookup('Нижег')) == ['Нижегородская обл.']
+
+
+def test_yo_and_ye_are_equal(index):
+    item, = index.lookup('Королев')
+    assert item == {'Id': '501', 'Name': 'г. Королёв', 'Kladr': '5000001000000', 'RegionId': '50', 'Type': 'city'}
+
+
+def test_filters_and_empty_name(index):
+    assert names(index.lookup('новгород', region_id='52')) == ['г. Нижний Новгород']
+    assert index.lookup('г.') == []
+    assert index.find_region('Королёв') is None
+    assert len(index) == 7
@@ -0,0 +1,35 @@
+import asyncio
+
+from src.database import database
+
+
+def test_replica_is_checked_in_background(monkeypatch):
+    checks = []
+
+    async def check():
+        checks.append(True)
+        return True
+
+    monkeypatch.setattr(database, 'read_engine', object())
+    monkeypatch.setattr(database.ReplicaMonitor, '_check', staticmethod(check))
+
+    async def scenario():
+        # До первой проверки чтение идет с основной БД
+        assert database.ReplicaMonitor.is_available() is False
+        database.ReplicaMonitor.start()
+        await asyncio.sleep(0)
+        available = database.ReplicaMonitor.is_available()
+        await database.ReplicaMonitor.stop()
+        return available
+
+    assert asyncio.run(scenario()) is True
+    assert checks == [True]
+    assert database.ReplicaMonitor.is_available() is False
+
+
+def test_stale_check_falls_back_to_primary(monkeypatch):
+    monkeypatch.setattr(database, 'read_engine', object())
+    monkeypatch.setattr(database.ReplicaMonitor, '_available', True)
+    monkeypatch.setattr(database.ReplicaMonitor, '_checked_at', float('-inf'))
+
+    assert database.ReplicaMonitor.is_available() is False
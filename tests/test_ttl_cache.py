@@ -0,0 +1,50 @@
+import asyncio
+
+from src.routers.elt.cache import TTLCache
+
+
+def test_waiters_survive_owner_cancellation():
+    cache = TTLCache(maxsize=4)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return len(calls)
+
+    async def run():
+        owner = asyncio.ensure_future(cache.get_or_load('key', loader, 60))
+        await asyncio.sleep(0)
+        waiters = [asyncio.ensure_future(cache.get_or_load('key', loader, 60)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        owner.cancel()
+        results = await asyncio.gather(*waiters)
+        return owner, results
+
+    owner, results = asyncio.run(run())
+
+    assert owner.cancelled()
+    # Один из ожидающих повторил загрузку, остальные получили его результат
+    assert results == [2, 2, 2]
+    assert len(calls) == 2
+
+
+def test_loader_error_reaches_waiters_without_retry():
+    cache = TTLCache(maxsize=4)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError('failed')
+
+    async def run():
+        return await asyncio.gather(
+            *(cache.get_or_load('key', loader, 60) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert len(calls) == 1
@@ -0,0 +1,123 @@
+import os
+
+import pytest
+from zeep.transports import Transport
+
+from src.config import settings
+from src.routers.elt import snapshot
+
+URL = 'http://elt.test/service.wsdl'
+XSD_URL = 'http://elt.test/types.xsd'
+
+WSDL = b'''<?xml version="1.0"?>
+<definitions xmlns="http://schemas.xmlsoap.org/wsdl/"
+             xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+             xmlns:xsd="http://www.w3.org/2001/XMLSchema"
+             xmlns:tns="http://elt.test/"
+             targetNamespace="http://elt.test/">
+  <types>
+    <xsd:schema targetNamespace="http://elt.test/">
+      <xsd:include schemaLocation="http://elt.test/types.xsd"/>
+    </xsd:schema>
+  </types>
+  <message name="PingRequest"><part name="parameters" element="tns:Ping"/></message>
+  <portType name="EltPort">
+    <operation name="Ping"><input message="tns:PingRequest"/></operation>
+  </portType>
+  <binding name="EltBinding" type="tns:EltPort">
+    <soap:binding style="document" transport="http://schemas.xmlsoap.org/soap/http"/>
+    <operation name="Ping">
+      <soap:operation soapAction="Ping"/>
+      <input><soap:body use="literal"/></input>
+    </operation>
+  </binding>
+  <service name="EltService">
+    <port name="EltPort" binding="tns:EltBinding"><soap:address location="http://elt.test/soap"/></port>
+  </service>
+</definitions>'''
+
+XSD = b'''<?xml version="1.0"?>
+<xsd:schema xmlns:xsd="http://www.w3.org/2001/XMLSchema" targetNamespace="http://elt.test/">
+  <xsd:element name="Ping" type="xsd:string"/>
+</xsd:schema>'''
+
+
+class FakeTransport(Transport):
+    """
+        Удаленный хост ELT: документы по URL, счетчик загрузок
+    """
+
+    def __init__(self, documents: dict):
+        super().__init__()
+        self.documents = documents
+        self.loaded = []
+
+    def _load_remote_data(self, url):
+        self.loaded.append(url)
+        if url not in self.documents:
+            raise ConnectionError(f'{url} is unavailable')
+        return self.documents[url]
+
+
+@pytest.fixture(autouse=True)
+def snapshot_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'WSDL_SNAPSHOT_DIR', str(tmp_path))
+    return tmp_path
+
+
+def test_documents_are_loaded_once_then_read_from_snapshot():
+    transport = FakeTransport({URL: WSDL, XSD_URL: XSD})
+    snapshot.load_document(URL, transport)
+    assert sorted(transport.loaded) == [URL, XSD_URL]
+
+    # Удаленный хост недоступен: WSDL разбирается из снимка
+    offline = FakeTransport({})
+    document = snapshot.load_document(URL, offline)
+
+    assert offline.loaded == []
+    assert 'EltService' in document.services
+
+
+def test_missing_document_is_fetched_and_added_to_snapshot():
+    snapshot.load_document(URL, FakeTransport({URL: WSDL, XSD_URL: XSD}))
+    saved = snapshot.WsdlSnapshot(URL)
+    os.remove(saved._object_path(saved._documents[XSD_URL]))
+
+    transport = FakeTransport({URL: WSDL, XSD_URL: XSD})
+    snapshot.load_document(URL, transport)
+
+    assert transport.loaded == [XSD_URL]
+    assert snapshot.WsdlSnapshot(URL).get(XSD_URL) == XSD
+
+
+def test_manifest_version_follows_content():
+    snapshot.load_document(URL, FakeTransport({URL: WSDL, XSD_URL: XSD}))
+    first = snapshot.WsdlSnapshot(URL).version
+
+    snapshot.load_document(URL, FakeTransport({URL: WSDL, XSD_URL: XSD}), refresh=True)
+    assert snapshot.WsdlSnapshot(URL).version == first
+
+    changed = XSD.replace(b'xsd:string', b'xsd:int')
+    snapshot.load_document(URL, FakeTransport({URL: WSDL, XSD_URL: changed}), refresh=True)
+    current = snapshot.WsdlSnapshot(URL)
+
+    assert current.version != first
+    assert current.get(XSD_URL) == changed
+    # Прежняя версия остается на диске
+    assert os.path.exists(os.path.join(current.directory, f'{first}.json'))
+
+
+def test_failed_write_keeps_previous_file(tmp_path, monkeypatch):
+    path = str(tmp_path / 'objects' / 'current')
+    snapshot.WsdlSnapshot._write_atomic(path, b'old')
+
+    def replace(source, target):
+        raise OSError('disk is full')
+
+    monkeypatch.setattr(snapshot.os, 'replace', replace)
+    with pytest.raises(OSError):
+        snapshot.WsdlSnapshot._write_atomic(path, b'new')
+
+    with open(path, 'rb') as file:
+        assert file.read() == b'old'
+    assert os.listdir(tmp_path / 'objects') == ['current']